@@ -27,7 +27,7 @@ elif pq.__impl__ == "binary":
     _psycopg = psycopg_binary._psycopg
     __version__ = psycopg_binary.__version__
 
-elif pq.__impl__ == "python":
+elif pq.__impl__ in ("python", "cffi"):
 
     _psycopg = None  # type: ignore[assignment]
 
@@ -12,6 +12,7 @@ implementation-dependant but all the implementations share the same interface.
 from __future__ import annotations
 
 import os
+import sys
 import logging
 from typing import Callable
 
@@ -26,7 +27,7 @@ logger = logging.getLogger(__name__)
 __impl__: str
 """The currently loaded implementation of the `!psycopg.pq` package.
 
-Possible values include ``python``, ``c``, ``binary``.
+Possible values include ``python``, ``cffi``, ``c``, ``binary``.
 """
 
 __build_version__: int
@@ -85,6 +86,16 @@ def import_from_libpq() -> None:
         except Exception as e:
             handle_error("binary", e)
 
+    # Pure Python implementation using cffi. Only chosen automatically on PyPy,
+    # where cffi is always available and optimised by the JIT.
+    if not module and (
+        impl == "cffi" or (not impl and sys.implementation.name == "pypy")
+    ):
+        try:
+            from . import pq_cffi as module  # type: ignore[assignment]
+        except Exception as e:
+            handle_error("cffi", e)
+
     # Pure Python implementation, slow and requires the system libpq installed.
     if not module and (not impl or impl == "python"):
         try:
@@ -0,0 +1,464 @@
+"""
+libpq access using cffi (ABI mode)
+"""
+
+# Copyright (C) 2020 The Psycopg Team
+
+from __future__ import annotations
+
+import sys
+from typing import Any, NoReturn
+
+from cffi import FFI
+
+from .misc import find_libpq_full_path, version_pretty
+from ..errors import NotSupportedError
+
+libname = find_libpq_full_path()
+if not libname:
+    raise ImportError("libpq library not found")
+
+ffi = FFI()
+
+# Declarations as found in libpq-fe.h. Opaque structures are only handled
+# through pointers; the layout of the public structures must match exactly.
+ffi.cdef(
+    """
+typedef unsigned int Oid;
+
+typedef struct pg_conn PGconn;
+typedef struct pg_result PGresult;
+typedef struct pg_cancel_conn PGcancelConn;
+typedef struct pg_cancel PGcancel;
+
+typedef struct _PQconninfoOption {
+    char *keyword;
+    char *envvar;
+    char *compiled;
+    char *val;
+    char *label;
+    char *dispchar;
+    int dispsize;
+} PQconninfoOption;
+
+typedef struct pgNotify {
+    char *relname;
+    int be_pid;
+    char *extra;
+    struct pgNotify *next;
+} PGnotify;
+
+typedef struct pgresAttDesc {
+    char *name;
+    Oid tableid;
+    int columnid;
+    int format;
+    Oid typid;
+    int typlen;
+    int atttypmod;
+} PGresAttDesc;
+
+typedef void (*PQnoticeReceiver) (void *arg, const PGresult *res);
+
+int PQlibVersion(void);
+
+/* 33.1. Database Connection Control Functions */
+
+PGconn *PQconnectdb(const char *conninfo);
+PGconn *PQconnectStart(const char *conninfo);
+int PQconnectPoll(PGconn *conn);
+PQconninfoOption *PQconndefaults(void);
+void PQconninfoFree(PQconninfoOption *connOptions);
+PQconninfoOption *PQconninfo(PGconn *conn);
+PQconninfoOption *PQconninfoParse(const char *conninfo, char **errmsg);
+void PQfinish(PGconn *conn);
+void PQreset(PGconn *conn);
+int PQresetStart(PGconn *conn);
+int PQresetPoll(PGconn *conn);
+int PQping(const char *conninfo);
+
+/* 33.2. Connection Status Functions */
+
+char *PQdb(const PGconn *conn);
+char *PQuser(const PGconn *conn);
+char *PQpass(const PGconn *conn);
+char *PQhost(const PGconn *conn);
+char *PQhostaddr(const PGconn *conn);
+char *PQport(const PGconn *conn);
+char *PQtty(const PGconn *conn);
+char *PQoptions(const PGconn *conn);
+int PQstatus(const PGconn *conn);
+int PQtransactionStatus(const PGconn *conn);
+const char *PQparameterStatus(const PGconn *conn, const char *paramName);
+int PQprotocolVersion(const PGconn *conn);
+int PQserverVersion(const PGconn *conn);
+char *PQerrorMessage(const PGconn *conn);
+int PQsocket(const PGconn *conn);
+int PQbackendPID(const PGconn *conn);
+int PQconnectionNeedsPassword(const PGconn *conn);
+int PQconnectionUsedPassword(const PGconn *conn);
+int PQsslInUse(PGconn *conn);
+
+/* 33.3. Command Execution Functions */
+
+PGresult *PQexec(PGconn *conn, const char *query);
+PGresult *PQexecParams(PGconn *conn, const char *command, int nParams,
+    const Oid *paramTypes, const char *const *paramValues,
+    const int *paramLengths, const int *paramFormats, int resultFormat);
+PGresult *PQprepare(PGconn *conn, const char *stmtName, const char *query,
+    int nParams, const Oid *paramTypes);
+PGresult *PQexecPrepared(PGconn *conn, const char *stmtName, int nParams,
+    const char *const *paramValues, const int *paramLengths,
+    const int *paramFormats, int resultFormat);
+PGresult *PQdescribePrepared(PGconn *conn, const char *stmt);
+PGresult *PQdescribePortal(PGconn *conn, const char *portal);
+PGresult *PQclosePrepared(PGconn *conn, const char *stmt);
+PGresult *PQclosePortal(PGconn *conn, const char *portal);
+int PQresultStatus(const PGresult *res);
+char *PQresultErrorMessage(const PGresult *res);
+char *PQresultErrorField(const PGresult *res, int fieldcode);
+void PQclear(PGresult *res);
+
+/* 33.3.2. Retrieving Query Result Information */
+
+int PQntuples(const PGresult *res);
+int PQnfields(const PGresult *res);
+char *PQfname(const PGresult *res, int field_num);
+Oid PQftable(const PGresult *res, int field_num);
+int PQftablecol(const PGresult *res, int field_num);
+int PQfformat(const PGresult *res, int field_num);
+Oid PQftype(const PGresult *res, int field_num);
+int PQfmod(const PGresult *res, int field_num);
+int PQfsize(const PGresult *res, int field_num);
+int PQbinaryTuples(const PGresult *res);
+char *PQgetvalue(const PGresult *res, int tup_num, int field_num);
+int PQgetisnull(const PGresult *res, int tup_num, int field_num);
+int PQgetlength(const PGresult *res, int tup_num, int field_num);
+int PQnparams(const PGresult *res);
+Oid PQparamtype(const PGresult *res, int param_num);
+
+/* 33.3.3. Retrieving Other Result Information */
+
+char *PQcmdStatus(PGresult *res);
+char *PQcmdTuples(PGresult *res);
+Oid PQoidValue(const PGresult *res);
+
+/* 33.3.4. Escaping Strings for Inclusion in SQL Commands */
+
+char *PQescapeLiteral(PGconn *conn, const char *str, size_t len);
+char *PQescapeIdentifier(PGconn *conn, const char *str, size_t len);
+size_t PQescapeStringConn(PGconn *conn, char *to, const char *from,
+    size_t length, int *error);
+size_t PQescapeString(char *to, const char *from, size_t length);
+/* actually unsigned char * in input, but this is easier */
+unsigned char *PQescapeByteaConn(PGconn *conn, const char *from,
+    size_t from_length, size_t *to_length);
+unsigned char *PQescapeBytea(const char *from, size_t from_length,
+    size_t *to_length);
+unsigned char *PQunescapeBytea(const char *strtext, size_t *retbuflen);
+
+/* 33.4. Asynchronous Command Processing */
+
+int PQsendQuery(PGconn *conn, const char *query);
+int PQsendQueryParams(PGconn *conn, const char *command, int nParams,
+    const Oid *paramTypes, const char *const *paramValues,
+    const int *paramLengths, const int *paramFormats, int resultFormat);
+int PQsendPrepare(PGconn *conn, const char *stmtName, const char *query,
+    int nParams, const Oid *paramTypes);
+int PQsendQueryPrepared(PGconn *conn, const char *stmtName, int nParams,
+    const char *const *paramValues, const int *paramLengths,
+    const int *paramFormats, int resultFormat);
+int PQsendDescribePrepared(PGconn *conn, const char *stmt);
+int PQsendDescribePortal(PGconn *conn, const char *portal);
+int PQsendClosePrepared(PGconn *conn, const char *stmt);
+int PQsendClosePortal(PGconn *conn, const char *portal);
+PGresult *PQgetResult(PGconn *conn);
+int PQconsumeInput(PGconn *conn);
+int PQisBusy(PGconn *conn);
+int PQsetnonblocking(PGconn *conn, int arg);
+int PQisnonblocking(const PGconn *conn);
+int PQflush(PGconn *conn);
+
+/* 32.6. Retrieving Query Results in Chunks */
+
+int PQsetSingleRowMode(PGconn *conn);
+int PQsetChunkedRowsMode(PGconn *conn, int chunkSize);
+
+/* 33.6. Canceling Queries in Progress */
+
+PGcancelConn *PQcancelCreate(PGconn *conn);
+int PQcancelStart(PGcancelConn *cancelConn);
+int PQcancelBlocking(PGcancelConn *cancelConn);
+int PQcancelPoll(PGcancelConn *cancelConn);
+int PQcancelStatus(const PGcancelConn *cancelConn);
+int PQcancelSocket(const PGcancelConn *cancelConn);
+char *PQcancelErrorMessage(const PGcancelConn *cancelConn);
+void PQcancelReset(PGcancelConn *cancelConn);
+void PQcancelFinish(PGcancelConn *cancelConn);
+PGcancel *PQgetCancel(PGconn *conn);
+void PQfreeCancel(PGcancel *cancel);
+int PQcancel(PGcancel *cancel, char *errbuf, int errbufsize);
+
+/* 33.8. Asynchronous Notification */
+
+PGnotify *PQnotifies(PGconn *conn);
+
+/* 33.9. Functions Associated with the COPY Command */
+
+int PQputCopyData(PGconn *conn, const char *buffer, int nbytes);
+int PQputCopyEnd(PGconn *conn, const char *errormsg);
+int PQgetCopyData(PGconn *conn, char **buffer, int async);
+
+/* 33.10. Control Functions */
+
+void PQtrace(PGconn *conn, FILE *debug_port);
+void PQsetTraceFlags(PGconn *conn, int flags);
+void PQuntrace(PGconn *conn);
+
+/* 33.11. Miscellaneous Functions */
+
+void PQfreemem(void *ptr);
+char *PQencryptPasswordConn(PGconn *conn, const char *passwd, const char *user,
+    const char *algorithm);
+PGresult *PQchangePassword(PGconn *conn, const char *user, const char *passwd);
+PGresult *PQmakeEmptyPGresult(PGconn *conn, int status);
+int PQsetResultAttrs(PGresult *res, int numAttributes, PGresAttDesc *attDescs);
+size_t PQresultMemorySize(const PGresult *res);
+
+/* 33.12. Notice Processing */
+
+PQnoticeReceiver PQsetNoticeReceiver(PGconn *conn, PQnoticeReceiver proc,
+    void *arg);
+
+/* 34.5 Pipeline Mode */
+
+int PQpipelineStatus(const PGconn *conn);
+int PQenterPipelineMode(PGconn *conn);
+int PQexitPipelineMode(PGconn *conn);
+int PQpipelineSync(PGconn *conn);
+int PQsendFlushRequest(PGconn *conn);
+
+/* 33.18. SSL Support */
+
+void PQinitOpenSSL(int do_ssl, int do_crypto);
+"""
+)
+
+pq = ffi.dlopen(libname)
+
+if sys.platform == "linux":
+    ffi.cdef("FILE *fdopen(int fd, const char *mode);")
+    # Symbols of the libc are already available in the process.
+    libc = ffi.dlopen(None)
+    fdopen = libc.fdopen
+
+
+# Get the libpq version to define what functions are available.
+
+PQlibVersion = pq.PQlibVersion
+
+libpq_version = PQlibVersion()
+
+
+def not_supported_before(fname: str, pgversion: int) -> Any:
+    def not_supported(*args: Any, **kwargs: Any) -> NoReturn:
+        raise NotSupportedError(
+            f"{fname} requires libpq from PostgreSQL {version_pretty(pgversion)} on"
+            f" the client; version {version_pretty(libpq_version)} available instead"
+        )
+
+    return not_supported
+
+
+def since(pgversion: int, fname: str) -> Any:
+    """
+    Return the libpq function *fname* if available in the libpq loaded.
+
+    If the libpq is too old, return a function raising `NotSupportedError`.
+    In ABI mode, symbols are only resolved on access, so missing functions
+    don't prevent to load the module.
+    """
+    if libpq_version >= pgversion:
+        return getattr(pq, fname)
+    else:
+        return not_supported_before(fname, pgversion)
+
+
+# 33.1. Database Connection Control Functions
+
+PQconnectdb = pq.PQconnectdb
+PQconnectStart = pq.PQconnectStart
+PQconnectPoll = pq.PQconnectPoll
+PQconndefaults = pq.PQconndefaults
+PQconninfoFree = pq.PQconninfoFree
+PQconninfo = pq.PQconninfo
+PQconninfoParse = pq.PQconninfoParse
+PQfinish = pq.PQfinish
+PQreset = pq.PQreset
+PQresetStart = pq.PQresetStart
+PQresetPoll = pq.PQresetPoll
+PQping = pq.PQping
+
+
+# 33.2. Connection Status Functions
+
+PQdb = pq.PQdb
+PQuser = pq.PQuser
+PQpass = pq.PQpass
+PQhost = pq.PQhost
+PQhostaddr = since(120000, "PQhostaddr")
+PQport = pq.PQport
+PQtty = pq.PQtty
+PQoptions = pq.PQoptions
+PQstatus = pq.PQstatus
+PQtransactionStatus = pq.PQtransactionStatus
+PQparameterStatus = pq.PQparameterStatus
+PQprotocolVersion = pq.PQprotocolVersion
+PQserverVersion = pq.PQserverVersion
+PQerrorMessage = pq.PQerrorMessage
+PQsocket = pq.PQsocket
+PQbackendPID = pq.PQbackendPID
+PQconnectionNeedsPassword = pq.PQconnectionNeedsPassword
+PQconnectionUsedPassword = pq.PQconnectionUsedPassword
+PQsslInUse = pq.PQsslInUse
+
+
+# 33.3. Command Execution Functions
+
+PQexec = pq.PQexec
+PQexecParams = pq.PQexecParams
+PQprepare = pq.PQprepare
+PQexecPrepared = pq.PQexecPrepared
+PQdescribePrepared = pq.PQdescribePrepared
+PQdescribePortal = pq.PQdescribePortal
+PQclosePrepared = since(170000, "PQclosePrepared")
+PQclosePortal = since(170000, "PQclosePortal")
+PQresultStatus = pq.PQresultStatus
+PQresultErrorMessage = pq.PQresultErrorMessage
+PQresultErrorField = pq.PQresultErrorField
+PQclear = pq.PQclear
+
+
+# 33.3.2. Retrieving Query Result Information
+
+PQntuples = pq.PQntuples
+PQnfields = pq.PQnfields
+PQfname = pq.PQfname
+PQftable = pq.PQftable
+PQftablecol = pq.PQftablecol
+PQfformat = pq.PQfformat
+PQftype = pq.PQftype
+PQfmod = pq.PQfmod
+PQfsize = pq.PQfsize
+PQbinaryTuples = pq.PQbinaryTuples
+PQgetvalue = pq.PQgetvalue
+PQgetisnull = pq.PQgetisnull
+PQgetlength = pq.PQgetlength
+PQnparams = pq.PQnparams
+PQparamtype = pq.PQparamtype
+
+
+# 33.3.3. Retrieving Other Result Information
+
+PQcmdStatus = pq.PQcmdStatus
+PQcmdTuples = pq.PQcmdTuples
+PQoidValue = pq.PQoidValue
+
+
+# 33.3.4. Escaping Strings for Inclusion in SQL Commands
+
+PQescapeLiteral = pq.PQescapeLiteral
+PQescapeIdentifier = pq.PQescapeIdentifier
+PQescapeStringConn = pq.PQescapeStringConn
+PQescapeString = pq.PQescapeString
+PQescapeByteaConn = pq.PQescapeByteaConn
+PQescapeBytea = pq.PQescapeBytea
+PQunescapeBytea = pq.PQunescapeBytea
+
+
+# 33.4. Asynchronous Command Processing
+
+PQsendQuery = pq.PQsendQuery
+PQsendQueryParams = pq.PQsendQueryParams
+PQsendPrepare = pq.PQsendPrepare
+PQsendQueryPrepared = pq.PQsendQueryPrepared
+PQsendDescribePrepared = pq.PQsendDescribePrepared
+PQsendDescribePortal = pq.PQsendDescribePortal
+PQsendClosePrepared = since(170000, "PQsendClosePrepared")
+PQsendClosePortal = since(170000, "PQsendClosePortal")
+PQgetResult = pq.PQgetResult
+PQconsumeInput = pq.PQconsumeInput
+PQisBusy = pq.PQisBusy
+PQsetnonblocking = pq.PQsetnonblocking
+PQisnonblocking = pq.PQisnonblocking
+PQflush = pq.PQflush
+
+
+# 32.6. Retrieving Query Results in Chunks
+
+PQsetSingleRowMode = pq.PQsetSingleRowMode
+PQsetChunkedRowsMode = since(170000, "PQsetChunkedRowsMode")
+
+
+# 33.6. Canceling Queries in Progress
+
+PQcancelCreate = since(170000, "PQcancelCreate")
+PQcancelStart = since(170000, "PQcancelStart")
+PQcancelBlocking = since(170000, "PQcancelBlocking")
+PQcancelPoll = since(170000, "PQcancelPoll")
+PQcancelStatus = since(170000, "PQcancelStatus")
+PQcancelSocket = since(170000, "PQcancelSocket")
+PQcancelErrorMessage = since(170000, "PQcancelErrorMessage")
+PQcancelReset = since(170000, "PQcancelReset")
+PQcancelFinish = since(170000, "PQcancelFinish")
+PQgetCancel = pq.PQgetCancel
+PQfreeCancel = pq.PQfreeCancel
+PQcancel = pq.PQcancel
+
+
+# 33.8. Asynchronous Notification
+
+PQnotifies = pq.PQnotifies
+
+
+# 33.9. Functions Associated with the COPY Command
+
+PQputCopyData = pq.PQputCopyData
+PQputCopyEnd = pq.PQputCopyEnd
+PQgetCopyData = pq.PQgetCopyData
+
+
+# 33.10. Control Functions
+
+PQtrace = pq.PQtrace
+PQsetTraceFlags = since(140000, "PQsetTraceFlags")
+PQuntrace = pq.PQuntrace
+
+
+# 33.11. Miscellaneous Functions
+
+PQfreemem = pq.PQfreemem
+PQencryptPasswordConn = since(100000, "PQencryptPasswordConn")
+PQchangePassword = since(170000, "PQchangePassword")
+PQmakeEmptyPGresult = pq.PQmakeEmptyPGresult
+PQsetResultAttrs = pq.PQsetResultAttrs
+PQresultMemorySize = since(120000, "PQresultMemorySize")
+
+
+# 33.12. Notice Processing
+
+PQsetNoticeReceiver = pq.PQsetNoticeReceiver
+
+
+# 34.5 Pipeline Mode
+
+PQpipelineStatus = since(140000, "PQpipelineStatus")
+PQenterPipelineMode = since(140000, "PQenterPipelineMode")
+PQexitPipelineMode = since(140000, "PQexitPipelineMode")
+PQpipelineSync = since(140000, "PQpipelineSync")
+PQsendFlushRequest = since(140000, "PQsendFlushRequest")
+
+
+# 33.18. SSL Support
+
+PQinitOpenSSL = pq.PQinitOpenSSL
@@ -0,0 +1,156 @@
+"""
+types stub for cffi functions
+"""
+
+# Copyright (C) 2020 The Psycopg Team
+
+# The cdata objects (pointers, structures, callbacks) are untyped: they are
+# only annotated as Any.
+
+from typing import Any
+
+ffi: Any
+libpq_version: int
+
+def fdopen(arg1: int, arg2: bytes) -> Any: ...
+def PQlibVersion() -> int: ...
+def PQconnectdb(arg1: Any) -> Any: ...
+def PQconnectStart(arg1: Any) -> Any: ...
+def PQconnectPoll(arg1: Any) -> int: ...
+def PQconndefaults() -> Any: ...
+def PQconninfoFree(arg1: Any) -> None: ...
+def PQconninfo(arg1: Any) -> Any: ...
+def PQconninfoParse(arg1: Any, arg2: Any) -> Any: ...
+def PQfinish(arg1: Any) -> None: ...
+def PQreset(arg1: Any) -> None: ...
+def PQresetStart(arg1: Any) -> int: ...
+def PQresetPoll(arg1: Any) -> int: ...
+def PQping(arg1: Any) -> int: ...
+def PQdb(arg1: Any) -> Any: ...
+def PQuser(arg1: Any) -> Any: ...
+def PQpass(arg1: Any) -> Any: ...
+def PQhost(arg1: Any) -> Any: ...
+def PQhostaddr(arg1: Any) -> Any: ...
+def PQport(arg1: Any) -> Any: ...
+def PQtty(arg1: Any) -> Any: ...
+def PQoptions(arg1: Any) -> Any: ...
+def PQstatus(arg1: Any) -> int: ...
+def PQtransactionStatus(arg1: Any) -> int: ...
+def PQparameterStatus(arg1: Any, arg2: Any) -> Any: ...
+def PQprotocolVersion(arg1: Any) -> int: ...
+def PQserverVersion(arg1: Any) -> int: ...
+def PQerrorMessage(arg1: Any) -> Any: ...
+def PQsocket(arg1: Any) -> int: ...
+def PQbackendPID(arg1: Any) -> int: ...
+def PQconnectionNeedsPassword(arg1: Any) -> int: ...
+def PQconnectionUsedPassword(arg1: Any) -> int: ...
+def PQsslInUse(arg1: Any) -> int: ...
+def PQexec(arg1: Any, arg2: Any) -> Any: ...
+def PQexecParams(
+    arg1: Any,
+    arg2: Any,
+    arg3: int,
+    arg4: Any,
+    arg5: Any,
+    arg6: Any,
+    arg7: Any,
+    arg8: int,
+) -> Any: ...
+def PQprepare(arg1: Any, arg2: Any, arg3: Any, arg4: int, arg5: Any) -> Any: ...
+def PQexecPrepared(
+    arg1: Any, arg2: Any, arg3: int, arg4: Any, arg5: Any, arg6: Any, arg7: int
+) -> Any: ...
+def PQdescribePrepared(arg1: Any, arg2: Any) -> Any: ...
+def PQdescribePortal(arg1: Any, arg2: Any) -> Any: ...
+def PQclosePrepared(arg1: Any, arg2: Any) -> Any: ...
+def PQclosePortal(arg1: Any, arg2: Any) -> Any: ...
+def PQresultStatus(arg1: Any) -> int: ...
+def PQresultErrorMessage(arg1: Any) -> Any: ...
+def PQresultErrorField(arg1: Any, arg2: int) -> Any: ...
+def PQclear(arg1: Any) -> None: ...
+def PQntuples(arg1: Any) -> int: ...
+def PQnfields(arg1: Any) -> int: ...
+def PQfname(arg1: Any, arg2: int) -> Any: ...
+def PQftable(arg1: Any, arg2: int) -> int: ...
+def PQftablecol(arg1: Any, arg2: int) -> int: ...
+def PQfformat(arg1: Any, arg2: int) -> int: ...
+def PQftype(arg1: Any, arg2: int) -> int: ...
+def PQfmod(arg1: Any, arg2: int) -> int: ...
+def PQfsize(arg1: Any, arg2: int) -> int: ...
+def PQbinaryTuples(arg1: Any) -> int: ...
+def PQgetvalue(arg1: Any, arg2: int, arg3: int) -> Any: ...
+def PQgetisnull(arg1: Any, arg2: int, arg3: int) -> int: ...
+def PQgetlength(arg1: Any, arg2: int, arg3: int) -> int: ...
+def PQnparams(arg1: Any) -> int: ...
+def PQparamtype(arg1: Any, arg2: int) -> int: ...
+def PQcmdStatus(arg1: Any) -> Any: ...
+def PQcmdTuples(arg1: Any) -> Any: ...
+def PQoidValue(arg1: Any) -> int: ...
+def PQescapeLiteral(arg1: Any, arg2: Any, arg3: int) -> Any: ...
+def PQescapeIdentifier(arg1: Any, arg2: Any, arg3: int) -> Any: ...
+def PQescapeStringConn(
+    arg1: Any, arg2: Any, arg3: Any, arg4: int, arg5: Any
+) -> int: ...
+def PQescapeString(arg1: Any, arg2: Any, arg3: int) -> int: ...
+def PQescapeByteaConn(arg1: Any, arg2: Any, arg3: int, arg4: Any) -> Any: ...
+def PQescapeBytea(arg1: Any, arg2: int, arg3: Any) -> Any: ...
+def PQunescapeBytea(arg1: Any, arg2: Any) -> Any: ...
+def PQsendQuery(arg1: Any, arg2: Any) -> int: ...
+def PQsendQueryParams(
+    arg1: Any,
+    arg2: Any,
+    arg3: int,
+    arg4: Any,
+    arg5: Any,
+    arg6: Any,
+    arg7: Any,
+    arg8: int,
+) -> int: ...
+def PQsendPrepare(arg1: Any, arg2: Any, arg3: Any, arg4: int, arg5: Any) -> int: ...
+def PQsendQueryPrepared(
+    arg1: Any, arg2: Any, arg3: int, arg4: Any, arg5: Any, arg6: Any, arg7: int
+) -> int: ...
+def PQsendDescribePrepared(arg1: Any, arg2: Any) -> int: ...
+def PQsendDescribePortal(arg1: Any, arg2: Any) -> int: ...
+def PQsendClosePrepared(arg1: Any, arg2: Any) -> int: ...
+def PQsendClosePortal(arg1: Any, arg2: Any) -> int: ...
+def PQgetResult(arg1: Any) -> Any: ...
+def PQconsumeInput(arg1: Any) -> int: ...
+def PQisBusy(arg1: Any) -> int: ...
+def PQsetnonblocking(arg1: Any, arg2: int) -> int: ...
+def PQisnonblocking(arg1: Any) -> int: ...
+def PQflush(arg1: Any) -> int: ...
+def PQsetSingleRowMode(arg1: Any) -> int: ...
+def PQsetChunkedRowsMode(arg1: Any, arg2: int) -> int: ...
+def PQcancelCreate(arg1: Any) -> Any: ...
+def PQcancelStart(arg1: Any) -> int: ...
+def PQcancelBlocking(arg1: Any) -> int: ...
+def PQcancelPoll(arg1: Any) -> int: ...
+def PQcancelStatus(arg1: Any) -> int: ...
+def PQcancelSocket(arg1: Any) -> int: ...
+def PQcancelErrorMessage(arg1: Any) -> Any: ...
+def PQcancelReset(arg1: Any) -> None: ...
+def PQcancelFinish(arg1: Any) -> None: ...
+def PQgetCancel(arg1: Any) -> Any: ...
+def PQfreeCancel(arg1: Any) -> None: ...
+def PQcancel(arg1: Any, arg2: Any, arg3: int) -> int: ...
+def PQnotifies(arg1: Any) -> Any: ...
+def PQputCopyData(arg1: Any, arg2: Any, arg3: int) -> int: ...
+def PQputCopyEnd(arg1: Any, arg2: Any) -> int: ...
+def PQgetCopyData(arg1: Any, arg2: Any, arg3: int) -> int: ...
+def PQtrace(arg1: Any, arg2: Any) -> None: ...
+def PQsetTraceFlags(arg1: Any, arg2: int) -> None: ...
+def PQuntrace(arg1: Any) -> None: ...
+def PQfreemem(arg1: Any) -> None: ...
+def PQencryptPasswordConn(arg1: Any, arg2: Any, arg3: Any, arg4: Any) -> Any: ...
+def PQchangePassword(arg1: Any, arg2: Any, arg3: Any) -> Any: ...
+def PQmakeEmptyPGresult(arg1: Any, arg2: int) -> Any: ...
+def PQsetResultAttrs(arg1: Any, arg2: int, arg3: Any) -> int: ...
+def PQresultMemorySize(arg1: Any) -> int: ...
+def PQsetNoticeReceiver(arg1: Any, arg2: Any, arg3: Any) -> Any: ...
+def PQpipelineStatus(arg1: Any) -> int: ...
+def PQenterPipelineMode(arg1: Any) -> int: ...
+def PQexitPipelineMode(arg1: Any) -> int: ...
+def PQpipelineSync(arg1: Any) -> int: ...
+def PQsendFlushRequest(arg1: Any) -> int: ...
+def PQinitOpenSSL(arg1: int, arg2: int) -> None: ...
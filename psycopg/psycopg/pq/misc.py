@@ -142,6 +142,12 @@ def _clean_error_message(msg: bytes, encoding: str) -> str:
         return "no error details available"
 
 
+def _check_conninfo(conninfo: bytes) -> None:
+    """Raise a TypeError if a connection string passed to the libpq is not bytes."""
+    if not isinstance(conninfo, bytes):
+        raise TypeError(f"bytes expected, got {type(conninfo)} instead")
+
+
 def connection_summary(pgconn: abc.PGconn) -> str:
     """
     Return summary information on a connection.
@@ -0,0 +1,1295 @@
+"""
+libpq Python wrapper using cffi bindings.
+
+This implementation is designed to be used on PyPy, where cffi is always
+available and where calls to C functions can be optimised by the JIT much
+better than ctypes ones.
+
+Clients shouldn't use this module directly, unless for testing: they should use
+the `pq` module instead, which is in charge of choosing the best
+implementation.
+"""
+
+# Copyright (C) 2020 The Psycopg Team
+
+from __future__ import annotations
+
+import sys
+import logging
+from os import getpid
+from weakref import ref
+from typing import Any, Callable, TYPE_CHECKING
+from collections.abc import Sequence
+
+from .. import errors as e
+from .._encodings import pg2pyenc
+from . import _pq_cffi as impl
+from .misc import PGnotify, ConninfoOption, PGresAttDesc
+from .misc import connection_summary, _check_conninfo, _clean_error_message
+from ._enums import ConnStatus, ExecStatus, Format, Trace
+
+# Imported locally to use them as ffi.gc destructors and from __del__ methods
+from ._pq_cffi import PQclear, PQfinish, PQfreeCancel, PQcancelFinish, PQstatus
+
+if TYPE_CHECKING:
+    from . import abc
+
+__impl__ = "cffi"
+
+logger = logging.getLogger("psycopg")
+
+ffi = impl.ffi
+NULL = ffi.NULL
+
+OK = ConnStatus.OK
+
+# Estimate of the memory allocated by the libpq for a connection (mostly its
+# input and output buffers, 16KB each at start), reported to the GC.
+PGCONN_SIZE = 40 * 1024
+
+# Estimate of the memory used by a value in a result, if the libpq cannot
+# report the size of the result.
+PGRESULT_VALUE_SIZE = 32
+
+
+def version() -> int:
+    """Return the version number of the libpq currently loaded.
+
+    The number is in the same format of `~psycopg.ConnectionInfo.server_version`.
+
+    Certain features might not be available if the libpq library used is too old.
+    """
+    return impl.PQlibVersion()
+
+
+@ffi.callback("PQnoticeReceiver")  # type: ignore[untyped-decorator]
+def notice_receiver(arg: Any, result_ptr: Any) -> None:
+    pgconn = ffi.from_handle(arg)()
+    if not (pgconn and pgconn.notice_handler):
+        return
+
+    res = PGresult(result_ptr)
+    try:
+        pgconn.notice_handler(res)
+    except Exception as exc:
+        logger.exception("error in notice receiver: %s", exc)
+    finally:
+        # Avoid destroying the pgresult_ptr, which is owned by the libpq
+        res._pgresult_ptr, p = NULL, res._pgresult_ptr
+        if p:
+            ffi.gc(p, None, res._size)
+
+
+def _finish_in_process(pid: int) -> Callable[[Any], None]:
+    """
+    Return a destructor for a `!PGconn` pointer created by the process *pid*.
+    """
+
+    def finish(ptr: Any) -> None:
+        # Close the connection only if it was created in this process,
+        # not if this object is being GC'd after fork.
+        if getpid() == pid:
+            PQfinish(ptr)
+
+    return finish
+
+
+def _result_size(pgresult_ptr: Any) -> int:
+    """
+    Return the memory allocated for a `!PGresult`, to report it to the GC.
+
+    The memory allocated by the libpq is not seen by the PyPy GC: without this
+    information it would run too rarely to free large results.
+    """
+    if impl.libpq_version >= 120000:
+        return impl.PQresultMemorySize(pgresult_ptr)
+    else:
+        nvalues = impl.PQntuples(pgresult_ptr) * impl.PQnfields(pgresult_ptr)
+        return nvalues * PGRESULT_VALUE_SIZE
+
+
+def _string(ptr: Any) -> bytes | None:
+    """Return the content of a NUL-terminated `!char *`, `!None` if NULL."""
+    return ffi.string(ptr) if ptr else None
+
+
+class PGconn:
+    """
+    Python representation of a libpq connection.
+    """
+
+    __slots__ = (
+        "_pgconn_ptr",
+        "notice_handler",
+        "notify_handler",
+        "_self_ptr",
+        "_procpid",
+        "__weakref__",
+    )
+
+    def __init__(self, pgconn_ptr: Any):
+        self.notice_handler: Callable[[abc.PGresult], None] | None = None
+        self.notify_handler: Callable[[PGnotify], None] | None = None
+
+        # The connection is closed when the pointer is collected, so there is
+        # no need for a __del__ method, which would make the GC slower.
+        self._procpid = getpid()
+        self._pgconn_ptr = ffi.gc(
+            pgconn_ptr, _finish_in_process(self._procpid), PGCONN_SIZE
+        )
+
+        # Keep alive for the lifetime of PGconn
+        self._self_ptr = ffi.new_handle(ref(self))
+        impl.PQsetNoticeReceiver(pgconn_ptr, notice_receiver, self._self_ptr)
+
+    def __repr__(self) -> str:
+        cls = f"{self.__class__.__module__}.{self.__class__.__qualname__}"
+        info = connection_summary(self)
+        return f"<{cls} {info} at 0x{id(self):x}>"
+
+    @classmethod
+    def connect(cls, conninfo: bytes) -> PGconn:
+        _check_conninfo(conninfo)
+
+        pgconn_ptr = impl.PQconnectdb(conninfo)
+        if not pgconn_ptr:
+            raise MemoryError("couldn't allocate PGconn")
+        return cls(pgconn_ptr)
+
+    @classmethod
+    def connect_start(cls, conninfo: bytes) -> PGconn:
+        _check_conninfo(conninfo)
+
+        pgconn_ptr = impl.PQconnectStart(conninfo)
+        if not pgconn_ptr:
+            raise MemoryError("couldn't allocate PGconn")
+        return cls(pgconn_ptr)
+
+    def connect_poll(self) -> int:
+        return self._call_int(impl.PQconnectPoll)
+
+    def finish(self) -> None:
+        self._pgconn_ptr, p = NULL, self._pgconn_ptr
+        if p:
+            ffi.gc(p, None, PGCONN_SIZE)
+            PQfinish(p)
+
+    @property
+    def pgconn_ptr(self) -> int | None:
+        """The pointer to the underlying `!PGconn` structure, as integer.
+
+        `!None` if the connection is closed.
+
+        The value can be used to pass the structure to libpq functions which
+        psycopg doesn't (currently) wrap, either in C or in Python using FFI
+        libraries such as `ctypes`.
+        """
+        if not self._pgconn_ptr:
+            return None
+
+        return int(ffi.cast("uintptr_t", self._pgconn_ptr))
+
+    @property
+    def info(self) -> list[ConninfoOption]:
+        self._ensure_pgconn()
+        opts = impl.PQconninfo(self._pgconn_ptr)
+        if not opts:
+            raise MemoryError("couldn't allocate connection info")
+        try:
+            return Conninfo._options_from_array(opts)
+        finally:
+            impl.PQconninfoFree(opts)
+
+    def reset(self) -> None:
+        self._ensure_pgconn()
+        impl.PQreset(self._pgconn_ptr)
+
+    def reset_start(self) -> None:
+        if not impl.PQresetStart(self._pgconn_ptr):
+            raise e.OperationalError("couldn't reset connection")
+
+    def reset_poll(self) -> int:
+        return self._call_int(impl.PQresetPoll)
+
+    @classmethod
+    def ping(cls, conninfo: bytes) -> int:
+        _check_conninfo(conninfo)
+
+        return impl.PQping(conninfo)
+
+    @property
+    def db(self) -> bytes:
+        return self._call_bytes(impl.PQdb)
+
+    @property
+    def user(self) -> bytes:
+        return self._call_bytes(impl.PQuser)
+
+    @property
+    def password(self) -> bytes:
+        return self._call_bytes(impl.PQpass)
+
+    @property
+    def host(self) -> bytes:
+        return self._call_bytes(impl.PQhost)
+
+    @property
+    def hostaddr(self) -> bytes:
+        return self._call_bytes(impl.PQhostaddr)
+
+    @property
+    def port(self) -> bytes:
+        return self._call_bytes(impl.PQport)
+
+    @property
+    def tty(self) -> bytes:
+        return self._call_bytes(impl.PQtty)
+
+    @property
+    def options(self) -> bytes:
+        return self._call_bytes(impl.PQoptions)
+
+    @property
+    def status(self) -> int:
+        return PQstatus(self._pgconn_ptr)
+
+    @property
+    def transaction_status(self) -> int:
+        return impl.PQtransactionStatus(self._pgconn_ptr)
+
+    def parameter_status(self, name: bytes) -> bytes | None:
+        self._ensure_pgconn()
+        return _string(impl.PQparameterStatus(self._pgconn_ptr, name))
+
+    @property
+    def error_message(self) -> bytes:
+        return _string(impl.PQerrorMessage(self._pgconn_ptr)) or b""
+
+    def get_error_message(self, encoding: str = "") -> str:
+        return _clean_error_message(self.error_message, encoding or self._encoding)
+
+    @property
+    def _encoding(self) -> str:
+        if self.status == OK:
+            pgenc = self.parameter_status(b"client_encoding") or b"UTF8"
+            return pg2pyenc(pgenc)
+        else:
+            return "utf-8"
+
+    @property
+    def protocol_version(self) -> int:
+        return self._call_int(impl.PQprotocolVersion)
+
+    @property
+    def server_version(self) -> int:
+        return self._call_int(impl.PQserverVersion)
+
+    @property
+    def socket(self) -> int:
+        rv = self._call_int(impl.PQsocket)
+        if rv == -1:
+            raise e.OperationalError("the connection is lost")
+        return rv
+
+    @property
+    def backend_pid(self) -> int:
+        return self._call_int(impl.PQbackendPID)
+
+    @property
+    def needs_password(self) -> bool:
+        """True if the connection authentication method required a password,
+        but none was available.
+
+        See :pq:`PQconnectionNeedsPassword` for details.
+        """
+        return bool(impl.PQconnectionNeedsPassword(self._pgconn_ptr))
+
+    @property
+    def used_password(self) -> bool:
+        """True if the connection authentication method used a password.
+
+        See :pq:`PQconnectionUsedPassword` for details.
+        """
+        return bool(impl.PQconnectionUsedPassword(self._pgconn_ptr))
+
+    @property
+    def ssl_in_use(self) -> bool:
+        return self._call_bool(impl.PQsslInUse)
+
+    def exec_(self, command: bytes) -> PGresult:
+        if not isinstance(command, bytes):
+            raise TypeError(f"bytes expected, got {type(command)} instead")
+        self._ensure_pgconn()
+        rv = impl.PQexec(self._pgconn_ptr, command)
+        if not rv:
+            raise e.OperationalError(
+                f"executing query failed: {self.get_error_message()}"
+            )
+        return PGresult(rv)
+
+    def send_query(self, command: bytes) -> None:
+        if not isinstance(command, bytes):
+            raise TypeError(f"bytes expected, got {type(command)} instead")
+        self._ensure_pgconn()
+        if not impl.PQsendQuery(self._pgconn_ptr, command):
+            raise e.OperationalError(
+                f"sending query failed: {self.get_error_message()}"
+            )
+
+    def exec_params(
+        self,
+        command: bytes,
+        param_values: Sequence[abc.Buffer | None] | None,
+        param_types: Sequence[int] | None = None,
+        param_formats: Sequence[int] | None = None,
+        result_format: int = Format.TEXT,
+    ) -> PGresult:
+        args, _buffers = self._query_params_args(
+            command, param_values, param_types, param_formats, result_format
+        )
+        self._ensure_pgconn()
+        rv = impl.PQexecParams(*args)
+        if not rv:
+            raise e.OperationalError(
+                f"executing query failed: {self.get_error_message()}"
+            )
+        return PGresult(rv)
+
+    def send_query_params(
+        self,
+        command: bytes,
+        param_values: Sequence[abc.Buffer | None] | None,
+        param_types: Sequence[int] | None = None,
+        param_formats: Sequence[int] | None = None,
+        result_format: int = Format.TEXT,
+    ) -> None:
+        args, _buffers = self._query_params_args(
+            command, param_values, param_types, param_formats, result_format
+        )
+        self._ensure_pgconn()
+        if not impl.PQsendQueryParams(*args):
+            raise e.OperationalError(
+                f"sending query and params failed: {self.get_error_message()}"
+            )
+
+    def send_prepare(
+        self,
+        name: bytes,
+        command: bytes,
+        param_types: Sequence[int] | None = None,
+    ) -> None:
+        if not param_types:
+            nparams = 0
+            atypes = NULL
+        else:
+            nparams = len(param_types)
+            atypes = ffi.new("Oid[]", param_types)
+
+        self._ensure_pgconn()
+        if not impl.PQsendPrepare(self._pgconn_ptr, name, command, nparams, atypes):
+            raise e.OperationalError(
+                f"sending query and params failed: {self.get_error_message()}"
+            )
+
+    def send_query_prepared(
+        self,
+        name: bytes,
+        param_values: Sequence[abc.Buffer | None] | None,
+        param_formats: Sequence[int] | None = None,
+        result_format: int = Format.TEXT,
+    ) -> None:
+        # repurpose this function with a cheeky replacement of query with name,
+        # drop the param_types from the result
+        args, _buffers = self._query_params_args(
+            name, param_values, None, param_formats, result_format
+        )
+        args = args[:3] + args[4:]
+
+        self._ensure_pgconn()
+        if not impl.PQsendQueryPrepared(*args):
+            raise e.OperationalError(
+                f"sending prepared query failed: {self.get_error_message()}"
+            )
+
+    def _query_params_args(
+        self,
+        command: bytes,
+        param_values: Sequence[abc.Buffer | None] | None,
+        param_types: Sequence[int] | None = None,
+        param_formats: Sequence[int] | None = None,
+        result_format: int = Format.TEXT,
+    ) -> tuple[tuple[Any, ...], list[Any]]:
+        """
+        Return the arguments for a libpq call and the buffers they refer to.
+
+        The buffers must be kept alive until the libpq function is called.
+        """
+        if not isinstance(command, bytes):
+            raise TypeError(f"bytes expected, got {type(command)} instead")
+
+        buffers, aparams, alengths = self._params_arrays(param_values)
+        nparams = len(buffers)
+
+        if not param_types:
+            atypes = NULL
+        else:
+            if len(param_types) != nparams:
+                raise ValueError(
+                    "got %d param_values but %d param_types"
+                    % (nparams, len(param_types))
+                )
+            atypes = ffi.new("Oid[]", param_types)
+
+        if not param_formats:
+            aformats = NULL
+        else:
+            if len(param_formats) != nparams:
+                raise ValueError(
+                    "got %d param_values but %d param_formats"
+                    % (nparams, len(param_formats))
+                )
+            aformats = ffi.new("int[]", param_formats)
+
+        args = (
+            self._pgconn_ptr,
+            command,
+            nparams,
+            atypes,
+            aparams,
+            alengths,
+            aformats,
+            result_format,
+        )
+        return args, buffers
+
+    @staticmethod
+    def _params_arrays(
+        param_values: Sequence[abc.Buffer | None] | None,
+    ) -> tuple[list[Any], Any, Any]:
+        """
+        Return the array of pointers to the params values and their lengths.
+
+        The values are not copied: the buffers returned, pointing to the
+        params, must be kept alive for as long as the arrays are in use.
+        """
+        if not param_values:
+            return [], NULL, NULL
+
+        buffers = [NULL if b is None else ffi.from_buffer(b) for b in param_values]
+        aparams = ffi.new("char *[]", buffers)
+        alengths = ffi.new("int[]", [len(b) if b else 0 for b in buffers])
+        return buffers, aparams, alengths
+
+    def prepare(
+        self,
+        name: bytes,
+        command: bytes,
+        param_types: Sequence[int] | None = None,
+    ) -> PGresult:
+        if not isinstance(name, bytes):
+            raise TypeError(f"'name' must be bytes, got {type(name)} instead")
+
+        if not isinstance(command, bytes):
+            raise TypeError(f"'command' must be bytes, got {type(command)} instead")
+
+        if not param_types:
+            nparams = 0
+            atypes = NULL
+        else:
+            nparams = len(param_types)
+            atypes = ffi.new("Oid[]", param_types)
+
+        self._ensure_pgconn()
+        rv = impl.PQprepare(self._pgconn_ptr, name, command, nparams, atypes)
+        if not rv:
+            raise e.OperationalError(
+                f"preparing query failed: {self.get_error_message()}"
+            )
+        return PGresult(rv)
+
+    def exec_prepared(
+        self,
+        name: bytes,
+        param_values: Sequence[abc.Buffer] | None,
+        param_formats: Sequence[int] | None = None,
+        result_format: int = 0,
+    ) -> PGresult:
+        if not isinstance(name, bytes):
+            raise TypeError(f"'name' must be bytes, got {type(name)} instead")
+
+        buffers, aparams, alengths = self._params_arrays(param_values)
+        nparams = len(buffers)
+
+        if not param_formats:
+            aformats = NULL
+        else:
+            if len(param_formats) != nparams:
+                raise ValueError(
+                    "got %d param_values but %d param_types"
+                    % (nparams, len(param_formats))
+                )
+            aformats = ffi.new("int[]", param_formats)
+
+        self._ensure_pgconn()
+        rv = impl.PQexecPrepared(
+            self._pgconn_ptr,
+            name,
+            nparams,
+            aparams,
+            alengths,
+            aformats,
+            result_format,
+        )
+        if not rv:
+            raise e.OperationalError(
+                f"executing prepared query failed: {self.get_error_message()}"
+            )
+        return PGresult(rv)
+
+    def describe_prepared(self, name: bytes) -> PGresult:
+        if not isinstance(name, bytes):
+            raise TypeError(f"'name' must be bytes, got {type(name)} instead")
+        self._ensure_pgconn()
+        rv = impl.PQdescribePrepared(self._pgconn_ptr, name)
+        if not rv:
+            raise e.OperationalError(
+                f"describe prepared failed: {self.get_error_message()}"
+            )
+        return PGresult(rv)
+
+    def send_describe_prepared(self, name: bytes) -> None:
+        if not isinstance(name, bytes):
+            raise TypeError(f"bytes expected, got {type(name)} instead")
+        self._ensure_pgconn()
+        if not impl.PQsendDescribePrepared(self._pgconn_ptr, name):
+            raise e.OperationalError(
+                f"sending describe prepared failed: {self.get_error_message()}"
+            )
+
+    def describe_portal(self, name: bytes) -> PGresult:
+        if not isinstance(name, bytes):
+            raise TypeError(f"'name' must be bytes, got {type(name)} instead")
+        self._ensure_pgconn()
+        rv = impl.PQdescribePortal(self._pgconn_ptr, name)
+        if not rv:
+            raise e.OperationalError(
+                f"describe portal failed: {self.get_error_message()}"
+            )
+        return PGresult(rv)
+
+    def send_describe_portal(self, name: bytes) -> None:
+        if not isinstance(name, bytes):
+            raise TypeError(f"bytes expected, got {type(name)} instead")
+        self._ensure_pgconn()
+        if not impl.PQsendDescribePortal(self._pgconn_ptr, name):
+            raise e.OperationalError(
+                f"sending describe portal failed: {self.get_error_message()}"
+            )
+
+    def close_prepared(self, name: bytes) -> PGresult:
+        if not isinstance(name, bytes):
+            raise TypeError(f"'name' must be bytes, got {type(name)} instead")
+        self._ensure_pgconn()
+        rv = impl.PQclosePrepared(self._pgconn_ptr, name)
+        if not rv:
+            raise e.OperationalError(
+                f"close prepared failed: {self.get_error_message()}"
+            )
+        return PGresult(rv)
+
+    def send_close_prepared(self, name: bytes) -> None:
+        if not isinstance(name, bytes):
+            raise TypeError(f"bytes expected, got {type(name)} instead")
+        self._ensure_pgconn()
+        if not impl.PQsendClosePrepared(self._pgconn_ptr, name):
+            raise e.OperationalError(
+                f"sending close prepared failed: {self.get_error_message()}"
+            )
+
+    def close_portal(self, name: bytes) -> PGresult:
+        if not isinstance(name, bytes):
+            raise TypeError(f"'name' must be bytes, got {type(name)} instead")
+        self._ensure_pgconn()
+        rv = impl.PQclosePortal(self._pgconn_ptr, name)
+        if not rv:
+            raise e.OperationalError(f"close portal failed: {self.get_error_message()}")
+        return PGresult(rv)
+
+    def send_close_portal(self, name: bytes) -> None:
+        if not isinstance(name, bytes):
+            raise TypeError(f"bytes expected, got {type(name)} instead")
+        self._ensure_pgconn()
+        if not impl.PQsendClosePortal(self._pgconn_ptr, name):
+            raise e.OperationalError(
+                f"sending close portal failed: {self.get_error_message()}"
+            )
+
+    def get_result(self) -> PGresult | None:
+        rv = impl.PQgetResult(self._pgconn_ptr)
+        return PGresult(rv) if rv else None
+
+    def consume_input(self) -> None:
+        if 1 != impl.PQconsumeInput(self._pgconn_ptr):
+            raise e.OperationalError(
+                f"consuming input failed: {self.get_error_message()}"
+            )
+
+    def is_busy(self) -> int:
+        return impl.PQisBusy(self._pgconn_ptr)
+
+    @property
+    def nonblocking(self) -> int:
+        return impl.PQisnonblocking(self._pgconn_ptr)
+
+    @nonblocking.setter
+    def nonblocking(self, arg: int) -> None:
+        if 0 > impl.PQsetnonblocking(self._pgconn_ptr, arg):
+            raise e.OperationalError(
+                f"setting nonblocking failed: {self.get_error_message()}"
+            )
+
+    def flush(self) -> int:
+        # PQflush segfaults if it receives a NULL connection
+        if not self._pgconn_ptr:
+            raise e.OperationalError("flushing failed: the connection is closed")
+        rv: int = impl.PQflush(self._pgconn_ptr)
+        if rv < 0:
+            raise e.OperationalError(f"flushing failed: {self.get_error_message()}")
+        return rv
+
+    def set_single_row_mode(self) -> None:
+        if not impl.PQsetSingleRowMode(self._pgconn_ptr):
+            raise e.OperationalError("setting single row mode failed")
+
+    def set_chunked_rows_mode(self, size: int) -> None:
+        if not impl.PQsetChunkedRowsMode(self._pgconn_ptr, size):
+            raise e.OperationalError("setting chunked rows mode failed")
+
+    def cancel_conn(self) -> PGcancelConn:
+        """
+        Create a connection over which a cancel request can be sent.
+
+        See :pq:`PQcancelCreate` for details.
+        """
+        rv = impl.PQcancelCreate(self._pgconn_ptr)
+        if not rv:
+            raise e.OperationalError("couldn't create cancelConn object")
+        return PGcancelConn(rv)
+
+    def get_cancel(self) -> PGcancel:
+        """
+        Create an object with the information needed to cancel a command.
+
+        See :pq:`PQgetCancel` for details.
+        """
+        rv = impl.PQgetCancel(self._pgconn_ptr)
+        if not rv:
+            raise e.OperationalError("couldn't create cancel object")
+        return PGcancel(rv)
+
+    def notifies(self) -> PGnotify | None:
+        ptr = impl.PQnotifies(self._pgconn_ptr)
+        if ptr:
+            rv = PGnotify(ffi.string(ptr.relname), ptr.be_pid, ffi.string(ptr.extra))
+            impl.PQfreemem(ptr)
+            return rv
+        else:
+            return None
+
+    def put_copy_data(self, buffer: abc.Buffer) -> int:
+        # No need to copy the buffer: the data is copied by the libpq.
+        data = ffi.from_buffer(buffer)
+        rv = impl.PQputCopyData(self._pgconn_ptr, data, len(data))
+        if rv < 0:
+            raise e.OperationalError(
+                f"sending copy data failed: {self.get_error_message()}"
+            )
+        return rv
+
+    def put_copy_end(self, error: bytes | None = None) -> int:
+        rv = impl.PQputCopyEnd(self._pgconn_ptr, NULL if error is None else error)
+        if rv < 0:
+            raise e.OperationalError(
+                f"sending copy end failed: {self.get_error_message()}"
+            )
+        return rv
+
+    def get_copy_data(self, async_: int) -> tuple[int, memoryview]:
+        buffer_ptr = ffi.new("char **")
+        nbytes = impl.PQgetCopyData(self._pgconn_ptr, buffer_ptr, async_)
+        if nbytes == -2:
+            raise e.OperationalError(
+                f"receiving copy data failed: {self.get_error_message()}"
+            )
+        if buffer_ptr[0]:
+            # TODO: do it without copy
+            data = ffi.unpack(buffer_ptr[0], nbytes)
+            impl.PQfreemem(buffer_ptr[0])
+            return nbytes, memoryview(data)
+        else:
+            return nbytes, memoryview(b"")
+
+    def trace(self, fileno: int) -> None:
+        """
+        Enable tracing of the client/server communication to a file stream.
+
+        See :pq:`PQtrace` for details.
+        """
+        if sys.platform != "linux":
+            raise e.NotSupportedError("currently only supported on Linux")
+        stream = impl.fdopen(fileno, b"w")
+        impl.PQtrace(self._pgconn_ptr, stream)
+
+    def set_trace_flags(self, flags: Trace) -> None:
+        """
+        Configure tracing behavior of client/server communication.
+
+        :param flags: operating mode of tracing.
+
+        See :pq:`PQsetTraceFlags` for details.
+        """
+        impl.PQsetTraceFlags(self._pgconn_ptr, flags)
+
+    def untrace(self) -> None:
+        """
+        Disable tracing, previously enabled through `trace()`.
+
+        See :pq:`PQuntrace` for details.
+        """
+        impl.PQuntrace(self._pgconn_ptr)
+
+    def encrypt_password(
+        self, passwd: bytes, user: bytes, algorithm: bytes | None = None
+    ) -> bytes:
+        """
+        Return the encrypted form of a PostgreSQL password.
+
+        See :pq:`PQencryptPasswordConn` for details.
+        """
+        out = impl.PQencryptPasswordConn(
+            self._pgconn_ptr, passwd, user, NULL if algorithm is None else algorithm
+        )
+        if not out:
+            raise e.OperationalError(
+                f"password encryption failed: {self.get_error_message()}"
+            )
+
+        rv: bytes = ffi.string(out)
+        impl.PQfreemem(out)
+        return rv
+
+    def change_password(self, user: bytes, passwd: bytes) -> None:
+        """
+        Change a PostgreSQL password.
+
+        :raises OperationalError: if the command to change password failed.
+
+        See :pq:`PQchangePassword` for details.
+        """
+        res = PGresult(impl.PQchangePassword(self._pgconn_ptr, user, passwd))
+        if res.status != ExecStatus.COMMAND_OK:
+            raise e.OperationalError(
+                f"failed to change password change command: {self.get_error_message()}"
+            )
+
+    def make_empty_result(self, exec_status: int) -> PGresult:
+        rv = impl.PQmakeEmptyPGresult(self._pgconn_ptr, exec_status)
+        if not rv:
+            raise MemoryError("couldn't allocate empty PGresult")
+        return PGresult(rv)
+
+    @property
+    def pipeline_status(self) -> int:
+        if version() < 140000:
+            return 0
+        return impl.PQpipelineStatus(self._pgconn_ptr)
+
+    def enter_pipeline_mode(self) -> None:
+        """Enter pipeline mode.
+
+        :raises ~e.OperationalError: in case of failure to enter the pipeline
+            mode.
+        """
+        if impl.PQenterPipelineMode(self._pgconn_ptr) != 1:
+            raise e.OperationalError("failed to enter pipeline mode")
+
+    def exit_pipeline_mode(self) -> None:
+        """Exit pipeline mode.
+
+        :raises ~e.OperationalError: in case of failure to exit the pipeline
+            mode.
+        """
+        if impl.PQexitPipelineMode(self._pgconn_ptr) != 1:
+            raise e.OperationalError(self.get_error_message())
+
+    def pipeline_sync(self) -> None:
+        """Mark a synchronization point in a pipeline.
+
+        :raises ~e.OperationalError: if the connection is not in pipeline mode
+            or if sync failed.
+        """
+        rv = impl.PQpipelineSync(self._pgconn_ptr)
+        if rv == 0:
+            raise e.OperationalError("connection not in pipeline mode")
+        if rv != 1:
+            raise e.OperationalError("failed to sync pipeline")
+
+    def send_flush_request(self) -> None:
+        """Sends a request for the server to flush its output buffer.
+
+        :raises ~e.OperationalError: if the flush request failed.
+        """
+        if impl.PQsendFlushRequest(self._pgconn_ptr) == 0:
+            raise e.OperationalError(
+                f"flush request failed: {self.get_error_message()}"
+            )
+
+    def _call_bytes(self, func: Callable[[Any], Any]) -> bytes:
+        """
+        Call one of the pgconn libpq functions returning a bytes pointer.
+        """
+        if not self._pgconn_ptr:
+            raise e.OperationalError("the connection is closed")
+        ptr = func(self._pgconn_ptr)
+        assert ptr
+        rv: bytes = ffi.string(ptr)
+        return rv
+
+    def _call_int(self, func: Callable[[Any], int]) -> int:
+        """
+        Call one of the pgconn libpq functions returning an int.
+        """
+        if not self._pgconn_ptr:
+            raise e.OperationalError("the connection is closed")
+        return func(self._pgconn_ptr)
+
+    def _call_bool(self, func: Callable[[Any], int]) -> bool:
+        """
+        Call one of the pgconn libpq functions returning a logical value.
+        """
+        if not self._pgconn_ptr:
+            raise e.OperationalError("the connection is closed")
+        return bool(func(self._pgconn_ptr))
+
+    def _ensure_pgconn(self) -> None:
+        if not self._pgconn_ptr:
+            raise e.OperationalError("the connection is closed")
+
+
+class PGresult:
+    """
+    Python representation of a libpq result.
+    """
+
+    __slots__ = ("_pgresult_ptr", "_size")
+
+    def __init__(self, pgresult_ptr: Any):
+        # The result is cleared when the pointer is collected, so there is no
+        # need for a __del__ method, which would make the GC slower.
+        self._size = _result_size(pgresult_ptr)
+        self._pgresult_ptr = ffi.gc(pgresult_ptr, PQclear, self._size)
+
+    def __repr__(self) -> str:
+        cls = f"{self.__class__.__module__}.{self.__class__.__qualname__}"
+        status = ExecStatus(self.status)
+        return f"<{cls} [{status.name}] at 0x{id(self):x}>"
+
+    def clear(self) -> None:
+        self._pgresult_ptr, p = NULL, self._pgresult_ptr
+        if p:
+            # Detach with the same size, to release the memory reported.
+            ffi.gc(p, None, self._size)
+            PQclear(p)
+
+    @property
+    def pgresult_ptr(self) -> int | None:
+        """The pointer to the underlying `!PGresult` structure, as integer.
+
+        `!None` if the result was cleared.
+
+        The value can be used to pass the structure to libpq functions which
+        psycopg doesn't (currently) wrap, either in C or in Python using FFI
+        libraries such as `ctypes`.
+        """
+        if not self._pgresult_ptr:
+            return None
+
+        return int(ffi.cast("uintptr_t", self._pgresult_ptr))
+
+    @property
+    def status(self) -> int:
+        return impl.PQresultStatus(self._pgresult_ptr)
+
+    @property
+    def error_message(self) -> bytes:
+        return _string(impl.PQresultErrorMessage(self._pgresult_ptr)) or b""
+
+    def get_error_message(self, encoding: str = "utf-8") -> str:
+        return _clean_error_message(self.error_message, encoding)
+
+    def error_field(self, fieldcode: int) -> bytes | None:
+        return _string(impl.PQresultErrorField(self._pgresult_ptr, fieldcode))
+
+    @property
+    def ntuples(self) -> int:
+        return impl.PQntuples(self._pgresult_ptr)
+
+    @property
+    def nfields(self) -> int:
+        return impl.PQnfields(self._pgresult_ptr)
+
+    def fname(self, column_number: int) -> bytes | None:
+        return _string(impl.PQfname(self._pgresult_ptr, column_number))
+
+    def ftable(self, column_number: int) -> int:
+        return impl.PQftable(self._pgresult_ptr, column_number)
+
+    def ftablecol(self, column_number: int) -> int:
+        return impl.PQftablecol(self._pgresult_ptr, column_number)
+
+    def fformat(self, column_number: int) -> int:
+        return impl.PQfformat(self._pgresult_ptr, column_number)
+
+    def ftype(self, column_number: int) -> int:
+        return impl.PQftype(self._pgresult_ptr, column_number)
+
+    def fmod(self, column_number: int) -> int:
+        return impl.PQfmod(self._pgresult_ptr, column_number)
+
+    def fsize(self, column_number: int) -> int:
+        return impl.PQfsize(self._pgresult_ptr, column_number)
+
+    @property
+    def binary_tuples(self) -> int:
+        return impl.PQbinaryTuples(self._pgresult_ptr)
+
+    def get_value(self, row_number: int, column_number: int) -> bytes | None:
+        length: int = impl.PQgetlength(self._pgresult_ptr, row_number, column_number)
+        if length:
+            v = impl.PQgetvalue(self._pgresult_ptr, row_number, column_number)
+            rv: bytes = ffi.unpack(v, length)
+            return rv
+        else:
+            if impl.PQgetisnull(self._pgresult_ptr, row_number, column_number):
+                return None
+            else:
+                return b""
+
+    @property
+    def nparams(self) -> int:
+        return impl.PQnparams(self._pgresult_ptr)
+
+    def param_type(self, param_number: int) -> int:
+        return impl.PQparamtype(self._pgresult_ptr, param_number)
+
+    @property
+    def command_status(self) -> bytes | None:
+        return _string(impl.PQcmdStatus(self._pgresult_ptr))
+
+    @property
+    def command_tuples(self) -> int | None:
+        rv = _string(impl.PQcmdTuples(self._pgresult_ptr))
+        return int(rv) if rv else None
+
+    @property
+    def oid_value(self) -> int:
+        return impl.PQoidValue(self._pgresult_ptr)
+
+    def set_attributes(self, descriptions: list[PGresAttDesc]) -> None:
+        # The names are copied by the libpq: they only need to live until
+        # the end of the call.
+        names = [ffi.new("char[]", desc.name) for desc in descriptions]
+        array = ffi.new(
+            "PGresAttDesc[]",
+            [(name, *desc[1:]) for name, desc in zip(names, descriptions)],
+        )
+        rv = impl.PQsetResultAttrs(self._pgresult_ptr, len(descriptions), array)
+        if rv == 0:
+            raise e.OperationalError("PQsetResultAttrs failed")
+
+
+class PGcancelConn:
+    """
+    Token to handle non-blocking cancellation requests.
+
+    Created by `PGconn.cancel_conn()`.
+    """
+
+    __slots__ = ("pgcancelconn_ptr",)
+
+    def __init__(self, pgcancelconn_ptr: Any):
+        self.pgcancelconn_ptr = pgcancelconn_ptr
+
+    def __del__(self) -> None:
+        self.finish()
+
+    def start(self) -> None:
+        """Requests that the server abandons processing of the current command
+        in a non-blocking manner.
+
+        See :pq:`PQcancelStart` for details.
+        """
+        if not impl.PQcancelStart(self.pgcancelconn_ptr):
+            raise e.OperationalError(
+                f"couldn't start cancellation: {self.get_error_message()}"
+            )
+
+    def blocking(self) -> None:
+        """Requests that the server abandons processing of the current command
+        in a blocking manner.
+
+        See :pq:`PQcancelBlocking` for details.
+        """
+        if not impl.PQcancelBlocking(self.pgcancelconn_ptr):
+            raise e.OperationalError(
+                f"couldn't start cancellation: {self.get_error_message()}"
+            )
+
+    def poll(self) -> int:
+        self._ensure_pgcancelconn()
+        return impl.PQcancelPoll(self.pgcancelconn_ptr)
+
+    @property
+    def status(self) -> int:
+        return impl.PQcancelStatus(self.pgcancelconn_ptr)
+
+    @property
+    def socket(self) -> int:
+        rv = impl.PQcancelSocket(self.pgcancelconn_ptr)
+        if rv == -1:
+            raise e.OperationalError("cancel connection not opened")
+        return rv
+
+    @property
+    def error_message(self) -> bytes:
+        return _string(impl.PQcancelErrorMessage(self.pgcancelconn_ptr)) or b""
+
+    def get_error_message(self, encoding: str = "utf-8") -> str:
+        return _clean_error_message(self.error_message, encoding)
+
+    def reset(self) -> None:
+        self._ensure_pgcancelconn()
+        impl.PQcancelReset(self.pgcancelconn_ptr)
+
+    def finish(self) -> None:
+        """
+        Free the data structure created by `PQcancelCreate()`.
+
+        Automatically invoked by `!__del__()`.
+
+        See :pq:`PQcancelFinish()` for details.
+        """
+        self.pgcancelconn_ptr, p = NULL, self.pgcancelconn_ptr
+        if p:
+            PQcancelFinish(p)
+
+    def _ensure_pgcancelconn(self) -> None:
+        if not self.pgcancelconn_ptr:
+            raise e.OperationalError("the cancel connection is closed")
+
+
+class PGcancel:
+    """
+    Token to cancel the current operation on a connection.
+
+    Created by `PGconn.get_cancel()`.
+    """
+
+    __slots__ = ("pgcancel_ptr",)
+
+    def __init__(self, pgcancel_ptr: Any):
+        self.pgcancel_ptr = pgcancel_ptr
+
+    def __del__(self) -> None:
+        self.free()
+
+    def free(self) -> None:
+        """
+        Free the data structure created by :pq:`PQgetCancel()`.
+
+        Automatically invoked by `!__del__()`.
+
+        See :pq:`PQfreeCancel()` for details.
+        """
+        self.pgcancel_ptr, p = NULL, self.pgcancel_ptr
+        if p:
+            PQfreeCancel(p)
+
+    def cancel(self) -> None:
+        """Requests that the server abandon processing of the current command.
+
+        See :pq:`PQcancel()` for details.
+        """
+        buf = ffi.new("char[]", 256)
+        res = impl.PQcancel(self.pgcancel_ptr, buf, len(buf))
+        if not res:
+            raise e.OperationalError(
+                f"cancel failed: {ffi.string(buf).decode('utf8', 'ignore')}"
+            )
+
+
+class Conninfo:
+    """
+    Utility object to manipulate connection strings.
+    """
+
+    @classmethod
+    def get_defaults(cls) -> list[ConninfoOption]:
+        opts = impl.PQconndefaults()
+        if not opts:
+            raise MemoryError("couldn't allocate connection defaults")
+        try:
+            return cls._options_from_array(opts)
+        finally:
+            impl.PQconninfoFree(opts)
+
+    @classmethod
+    def parse(cls, conninfo: bytes) -> list[ConninfoOption]:
+        _check_conninfo(conninfo)
+
+        errmsg = ffi.new("char **")
+        rv = impl.PQconninfoParse(conninfo, errmsg)
+        if not rv:
+            if not errmsg[0]:
+                raise MemoryError("couldn't allocate on conninfo parse")
+            else:
+                exc = e.OperationalError(
+                    ffi.string(errmsg[0]).decode("utf8", "replace")
+                )
+                impl.PQfreemem(errmsg[0])
+                raise exc
+
+        try:
+            return cls._options_from_array(rv)
+        finally:
+            impl.PQconninfoFree(rv)
+
+    @classmethod
+    def _options_from_array(cls, opts: Any) -> list[ConninfoOption]:
+        rv = []
+        i = 0
+        while True:
+            opt = opts[i]
+            if not opt.keyword:
+                break
+            rv.append(
+                ConninfoOption(
+                    ffi.string(opt.keyword),
+                    _string(opt.envvar),
+                    _string(opt.compiled),
+                    _string(opt.val),
+                    _string(opt.label),  # type: ignore[arg-type]
+                    _string(opt.dispchar),  # type: ignore[arg-type]
+                    opt.dispsize,
+                )
+            )
+            i += 1
+
+        return rv
+
+
+class Escaping:
+    """
+    Utility object to escape strings for SQL interpolation.
+    """
+
+    def __init__(self, conn: PGconn | None = None):
+        self.conn = conn
+
+    def escape_literal(self, data: abc.Buffer) -> bytes:
+        if not self.conn:
+            raise e.OperationalError("escape_literal failed: no connection provided")
+
+        self.conn._ensure_pgconn()
+        data = ffi.from_buffer(data)
+        out = impl.PQescapeLiteral(self.conn._pgconn_ptr, data, len(data))
+        if not out:
+            raise e.OperationalError(
+                f"escape_literal failed: {self.conn.get_error_message()} bytes"
+            )
+        rv: bytes = ffi.string(out)
+        impl.PQfreemem(out)
+        return rv
+
+    def escape_identifier(self, data: abc.Buffer) -> bytes:
+        if not self.conn:
+            raise e.OperationalError("escape_identifier failed: no connection provided")
+
+        self.conn._ensure_pgconn()
+
+        data = ffi.from_buffer(data)
+        out = impl.PQescapeIdentifier(self.conn._pgconn_ptr, data, len(data))
+        if not out:
+            raise e.OperationalError(
+                f"escape_identifier failed: {self.conn.get_error_message()} bytes"
+            )
+        rv: bytes = ffi.string(out)
+        impl.PQfreemem(out)
+        return rv
+
+    def escape_string(self, data: abc.Buffer) -> bytes:
+        data = ffi.from_buffer(data)
+        out = ffi.new("char[]", len(data) * 2 + 1)
+
+        if self.conn:
+            self.conn._ensure_pgconn()
+            error = ffi.new("int *")
+            impl.PQescapeStringConn(self.conn._pgconn_ptr, out, data, len(data), error)
+
+            if error[0]:
+                raise e.OperationalError(
+                    f"escape_string failed: {self.conn.get_error_message()} bytes"
+                )
+
+        else:
+            impl.PQescapeString(out, data, len(data))
+
+        rv: bytes = ffi.string(out)
+        return rv
+
+    def escape_bytea(self, data: abc.Buffer) -> bytes:
+        len_out = ffi.new("size_t *")
+        data = ffi.from_buffer(data)
+        if self.conn:
+            self.conn._ensure_pgconn()
+            out = impl.PQescapeByteaConn(
+                self.conn._pgconn_ptr, data, len(data), len_out
+            )
+        else:
+            out = impl.PQescapeBytea(data, len(data), len_out)
+        if not out:
+            raise MemoryError(
+                f"couldn't allocate for escape_bytea of {len(data)} bytes"
+            )
+
+        rv: bytes = ffi.buffer(out, len_out[0] - 1)[:]  # out includes final 0
+        impl.PQfreemem(out)
+        return rv
+
+    def unescape_bytea(self, data: abc.Buffer) -> bytes:
+        # not needed, but let's keep it symmetric with the escaping:
+        # if a connection is passed in, it must be valid.
+        if self.conn:
+            self.conn._ensure_pgconn()
+
+        len_out = ffi.new("size_t *")
+        # The input must be NUL-terminated: make a copy to ensure it.
+        out = impl.PQunescapeBytea(ffi.new("char[]", bytes(data)), len_out)
+        if not out:
+            raise MemoryError(
+                f"couldn't allocate for unescape_bytea of {len(data)} bytes"
+            )
+
+        rv: bytes = ffi.buffer(out, len_out[0])[:]
+        impl.PQfreemem(out)
+        return rv
+
+
+# importing the ssl module sets up Python's libcrypto callbacks
+import ssl  # noqa
+
+# disable libcrypto setup in libpq, so it won't stomp on the callbacks
+# that have already been set up
+impl.PQinitOpenSSL(1, 0)
+
+__build_version__ = version()
@@ -26,7 +26,7 @@ from .. import errors as e
 from .._encodings import pg2pyenc
 from . import _pq_ctypes as impl
 from .misc import PGnotify, ConninfoOption, PGresAttDesc
-from .misc import connection_summary, _clean_error_message
+from .misc import connection_summary, _check_conninfo, _clean_error_message
 from ._enums import ConnStatus, ExecStatus, Format, Trace
 
 # Imported locally to call them from __del__ methods
@@ -108,8 +108,7 @@ class PGconn:
 
     @classmethod
     def connect(cls, conninfo: bytes) -> PGconn:
-        if not isinstance(conninfo, bytes):
-            raise TypeError(f"bytes expected, got {type(conninfo)} instead")
+        _check_conninfo(conninfo)
 
         pgconn_ptr = impl.PQconnectdb(conninfo)
         if not pgconn_ptr:
@@ -118,8 +117,7 @@ class PGconn:
 
     @classmethod
     def connect_start(cls, conninfo: bytes) -> PGconn:
-        if not isinstance(conninfo, bytes):
-            raise TypeError(f"bytes expected, got {type(conninfo)} instead")
+        _check_conninfo(conninfo)
 
         pgconn_ptr = impl.PQconnectStart(conninfo)
         if not pgconn_ptr:
@@ -172,9 +170,8 @@ class PGconn:
         return self._call_int(impl.PQresetPoll)
 
     @classmethod
-    def ping(self, conninfo: bytes) -> int:
-        if not isinstance(conninfo, bytes):
-            raise TypeError(f"bytes expected, got {type(conninfo)} instead")
+    def ping(cls, conninfo: bytes) -> int:
+        _check_conninfo(conninfo)
 
         return impl.PQping(conninfo)
 
@@ -1106,8 +1103,7 @@ class Conninfo:
 
     @classmethod
     def parse(cls, conninfo: bytes) -> list[ConninfoOption]:
-        if not isinstance(conninfo, bytes):
-            raise TypeError(f"bytes expected, got {type(conninfo)} instead")
+        _check_conninfo(conninfo)
 
         errmsg = c_char_p()
         rv = impl.PQconninfoParse(conninfo, byref(errmsg))  # type: ignore[arg-type]
@@ -1131,13 +1127,20 @@ class Conninfo:
         cls, opts: Sequence[impl.PQconninfoOption_struct]
     ) -> list[ConninfoOption]:
         rv = []
-        skws = "keyword envvar compiled val label dispchar".split()
         for opt in opts:
             if not opt.keyword:
                 break
-            d = {kw: getattr(opt, kw) for kw in skws}
-            d["dispsize"] = opt.dispsize
-            rv.append(ConninfoOption(**d))
+            rv.append(
+                ConninfoOption(
+                    opt.keyword,
+                    opt.envvar,
+                    opt.compiled,
+                    opt.val,
+                    opt.label,
+                    opt.dispchar,
+                    opt.dispsize,
+                )
+            )
 
         return rv
 
@@ -7,6 +7,7 @@ psycopg server-side cursor objects.
 from __future__ import annotations
 
 from typing import Any, overload, TYPE_CHECKING
+from operator import index
 from warnings import warn
 from collections.abc import AsyncIterator, Iterable, Iterator
 
@@ -17,30 +18,58 @@ from .abc import ConnectionType, Query, Params, PQGen
 from .rows import Row, RowFactory, AsyncRowFactory
 from .cursor import Cursor
 from ._compat import Self
-from .generators import execute
 from ._cursor_base import BaseCursor
 from .cursor_async import AsyncCursor
+from ._capabilities import capabilities
+from .generators import execute, fetch_many, send
 
 if TYPE_CHECKING:
     from .connection import Connection
+    from ._queries import PostgresQuery
     from .connection_async import AsyncConnection
 
 DEFAULT_ITERSIZE = 100
 
+# Parameters of the adaptive itersize, used if `itersize` is set to None: the
+# batches grow from DEFAULT_ITERSIZE records up to about ITER_TARGET_SIZE
+# bytes, and never above MAX_ITERSIZE records.
+ITER_TARGET_SIZE = 256 * 1024
+MAX_ITERSIZE = 10_000
+
+# The size of a value of variable length is not known before fetching it:
+# this is only a guess, used to estimate the size of the records.
+ITER_VARLENA_SIZE = 256
+
 TEXT = pq.Format.TEXT
 BINARY = pq.Format.BINARY
 
+OK = pq.ConnStatus.OK
+
 COMMAND_OK = pq.ExecStatus.COMMAND_OK
 TUPLES_OK = pq.ExecStatus.TUPLES_OK
+PIPELINE_SYNC = pq.ExecStatus.PIPELINE_SYNC
 
 IDLE = pq.TransactionStatus.IDLE
 INTRANS = pq.TransactionStatus.INTRANS
 
+# Fragments of the statements used to manage the cursors, built only once.
+_DECLARE = sql.SQL("DECLARE ")
+_SCROLL_CURSOR = {
+    None: sql.SQL(" CURSOR "),
+    True: sql.SQL(" SCROLL CURSOR "),
+    False: sql.SQL(" NO SCROLL CURSOR "),
+}
+_HOLD_FOR = {True: sql.SQL("WITH HOLD FOR "), False: sql.SQL("FOR ")}
+_CURSOR_EXISTS = sql.SQL("SELECT 1 FROM pg_catalog.pg_cursors WHERE name = ")
+_MOVE = {"relative": b"MOVE %d FROM %s", "absolute": b"MOVE ABSOLUTE %d FROM %s"}
+
 
 class ServerCursorMixin(BaseCursor[ConnectionType, Row]):
     """Mixin to add ServerCursor behaviour and implementation a BaseCursor."""
 
-    __slots__ = "_name _scrollable _withhold _described itersize _format".split()
+    __slots__ = """
+        _name _bname _scrollable _withhold _described itersize _format _ident
+        """.split()
 
     def __init__(
         self,
@@ -52,8 +81,11 @@ class ServerCursorMixin(BaseCursor[ConnectionType, Row]):
         self._scrollable = scrollable
         self._withhold = withhold
         self._described = False
-        self.itersize: int = DEFAULT_ITERSIZE
+        self.itersize: int | None = DEFAULT_ITERSIZE
         self._format = TEXT
+        # An ASCII name is the same in every client encoding: encode it once.
+        self._bname = name.encode() if name.isascii() else b""
+        self._ident = b""
 
     def __repr__(self) -> str:
         # Insert the name as the second word
@@ -113,10 +145,6 @@ class ServerCursorMixin(BaseCursor[ConnectionType, Row]):
 
         yield from self._start_query(query)
         pgq = self._convert_query(query, params)
-        self._execute_send(pgq, force_extended=True)
-        results = yield from execute(self._conn.pgconn)
-        if results[-1].status != COMMAND_OK:
-            self._raise_for_result(results[-1])
 
         # Set the format, which will be used by describe and fetch operations
         if binary is None:
@@ -124,11 +152,51 @@ class ServerCursorMixin(BaseCursor[ConnectionType, Row]):
         else:
             self._format = BINARY if binary else TEXT
 
+        if capabilities.has_pipeline():
+            yield from self._declare_pipeline_gen(pgq)
+            return
+
+        self._execute_send(pgq, force_extended=True)
+        results = yield from execute(self._conn.pgconn)
+        if results[-1].status != COMMAND_OK:
+            self._raise_for_result(results[-1])
+
         # The above result only returned COMMAND_OK. Get the cursor shape
         yield from self._describe_gen()
 
+    def _declare_pipeline_gen(self, pgq: PostgresQuery) -> PQGen[None]:
+        """
+        Send the DECLARE and the describe of the new portal in a single batch.
+
+        Use the libpq pipeline mode to avoid waiting for the result of the
+        DECLARE before asking for the cursor shape, saving a round-trip.
+        """
+        pgconn = self._pgconn
+        pgconn.enter_pipeline_mode()
+        try:
+            self._execute_send(pgq, force_extended=True)
+            pgconn.send_describe_portal(self._get_bname())
+            pgconn.pipeline_sync()
+            yield from send(pgconn)
+            declared = yield from fetch_many(pgconn)
+            described = yield from fetch_many(pgconn)
+            synced = yield from fetch_many(pgconn)
+        finally:
+            if pgconn.pipeline_status and pgconn.status == OK:
+                pgconn.exit_pipeline_mode()
+
+        if declared[-1].status != COMMAND_OK:
+            self._raise_for_result(declared[-1])
+        if synced[-1].status != PIPELINE_SYNC:
+            self._raise_for_result(synced[-1])
+
+        self._check_results(described)
+        self._results = described
+        self._select_current_result(0, format=self._format)
+        self._described = True
+
     def _describe_gen(self) -> PQGen[None]:
-        self._pgconn.send_describe_portal(self._name.encode(self._encoding))
+        self._pgconn.send_describe_portal(self._get_bname())
         results = yield from execute(self._pgconn)
         self._check_results(results)
         self._results = results
@@ -149,17 +217,14 @@ class ServerCursorMixin(BaseCursor[ConnectionType, Row]):
         # if we didn't declare the cursor ourselves we still have to close it
         # but we must make sure it exists.
         if not self._described:
-            query = sql.SQL(
-                "SELECT 1 FROM pg_catalog.pg_cursors WHERE name = {}"
-            ).format(sql.Literal(self._name))
+            query = sql.Composed([_CURSOR_EXISTS, sql.Literal(self._name)])
             res = yield from self._conn._exec_command(query)
             # pipeline mode otherwise, unsupported here.
             assert res is not None
             if res.ntuples == 0:
                 return
 
-        query = sql.SQL("CLOSE {}").format(sql.Identifier(self._name))
-        yield from self._conn._exec_command(query)
+        yield from self._conn._exec_command(b"CLOSE " + self._get_ident())
 
     def _fetch_gen(self, num: int | None) -> PQGen[list[Row]]:
         if self.closed:
@@ -169,10 +234,7 @@ class ServerCursorMixin(BaseCursor[ConnectionType, Row]):
             yield from self._start_query()
             yield from self._describe_gen()
 
-        query = sql.SQL("FETCH FORWARD {} FROM {}").format(
-            sql.SQL("ALL") if num is None else sql.Literal(num),
-            sql.Identifier(self._name),
-        )
+        query = self._make_fetch_statement(num)
         res = yield from self._conn._exec_command(query, result_format=self._format)
         # pipeline mode otherwise, unsupported here.
         assert res is not None
@@ -182,34 +244,91 @@ class ServerCursorMixin(BaseCursor[ConnectionType, Row]):
         return self._tx.load_rows(0, res.ntuples, self._make_row)
 
     def _scroll_gen(self, value: int, mode: str) -> PQGen[None]:
-        if mode not in ("relative", "absolute"):
-            raise ValueError(f"bad mode: {mode}. It should be 'relative' or 'absolute'")
-        query = sql.SQL("MOVE{} {} FROM {}").format(
-            sql.SQL(" ABSOLUTE" if mode == "absolute" else ""),
-            sql.Literal(value),
-            sql.Identifier(self._name),
-        )
+        try:
+            tmpl = _MOVE[mode]
+        except KeyError:
+            raise ValueError(
+                f"bad mode: {mode}. It should be 'relative' or 'absolute'"
+            ) from None
+        # Don't let bytes formatting truncate non-integer values.
+        query = tmpl % (index(value), self._get_ident())
         yield from self._conn._exec_command(query)
 
+    def _iter_sizes(self) -> Iterator[int]:
+        """
+        Generate the number of records to fetch per batch when iterating.
+
+        If `itersize` is `!None`, start from `DEFAULT_ITERSIZE` records and
+        double the size of every following batch, up to the number of records
+        estimated by `_get_target_itersize()`.
+        """
+        size = 0
+        while True:
+            if self.itersize is not None:
+                yield self.itersize
+                continue
+
+            if not size:
+                size = DEFAULT_ITERSIZE
+            else:
+                size = min(size * 2, self._get_target_itersize())
+            yield size
+
+    def _get_target_itersize(self) -> int:
+        """
+        Return the number of records of about `ITER_TARGET_SIZE` bytes.
+
+        Estimate it from the size of the cursor columns.
+        """
+        # If the cursor was not described yet we don't know its shape.
+        res = self.pgresult
+        if not (res and res.nfields):
+            return DEFAULT_ITERSIZE
+
+        row_size = 0
+        for i in range(res.nfields):
+            size = res.fsize(i)
+            row_size += size if size > 0 else ITER_VARLENA_SIZE
+
+        return max(1, min(MAX_ITERSIZE, ITER_TARGET_SIZE // row_size))
+
+    def _make_fetch_statement(self, num: int | None) -> bytes:
+        if num is None:
+            return b"FETCH FORWARD ALL FROM " + self._get_ident()
+        return b"FETCH FORWARD %d FROM %s" % (index(num), self._get_ident())
+
+    def _get_bname(self) -> bytes:
+        """Return the name of the cursor, encoded in the connection encoding."""
+        return self._bname or self._name.encode(self._encoding)
+
+    def _get_ident(self) -> bytes:
+        """Return the name of the cursor, escaped as an identifier."""
+        if self._ident:
+            return self._ident
+
+        ident = sql.Identifier(self._name).as_bytes(self._conn)
+        # The name cannot change: if it doesn't depend on the client encoding
+        # it can be escaped only once.
+        if self._bname:
+            self._ident = ident
+        return ident
+
     def _make_declare_statement(self, query: Query) -> sql.Composed:
         if isinstance(query, bytes):
             query = query.decode(self._encoding)
         if not isinstance(query, sql.Composable):
             query = sql.SQL(query)
 
-        parts = [
-            sql.SQL("DECLARE"),
-            sql.Identifier(self._name),
-        ]
-        if self._scrollable is not None:
-            parts.append(sql.SQL("SCROLL" if self._scrollable else "NO SCROLL"))
-        parts.append(sql.SQL("CURSOR"))
-        if self._withhold:
-            parts.append(sql.SQL("WITH HOLD"))
-        parts.append(sql.SQL("FOR"))
-        parts.append(query)
-
-        return sql.SQL(" ").join(parts)
+        scrollable = None if self._scrollable is None else bool(self._scrollable)
+        return sql.Composed(
+            [
+                _DECLARE,
+                sql.Identifier(self._name),
+                _SCROLL_CURSOR[scrollable],
+                _HOLD_FOR[bool(self._withhold)],
+                query,
+            ]
+        )
 
 
 class ServerCursor(ServerCursorMixin["Connection[Any]", Row], Cursor[Row]):
@@ -330,13 +449,15 @@ class ServerCursor(ServerCursorMixin["Connection[Any]", Row], Cursor[Row]):
         return recs
 
     def __iter__(self) -> Iterator[Row]:
+        sizes = self._iter_sizes()
         while True:
+            num = next(sizes)
             with self._conn.lock:
-                recs = self._conn.wait(self._fetch_gen(self.itersize))
+                recs = self._conn.wait(self._fetch_gen(num))
             for rec in recs:
                 self._pos += 1
                 yield rec
-            if len(recs) < self.itersize:
+            if len(recs) < num:
                 break
 
     def scroll(self, value: int, mode: str = "relative") -> None:
@@ -462,13 +583,15 @@ class AsyncServerCursor(
         return recs
 
     async def __aiter__(self) -> AsyncIterator[Row]:
+        sizes = self._iter_sizes()
         while True:
+            num = next(sizes)
             async with self._conn.lock:
-                recs = await self._conn.wait(self._fetch_gen(self.itersize))
+                recs = await self._conn.wait(self._fetch_gen(num))
             for rec in recs:
                 self._pos += 1
                 yield rec
-            if len(recs) < self.itersize:
+            if len(recs) < num:
                 break
 
     async def scroll(self, value: int, mode: str = "relative") -> None:
@@ -24,6 +24,8 @@ class _BaseStrDumper(Dumper):
         super().__init__(cls, context)
         enc = conn_encoding(self.connection)
         self._encoding = enc if enc != "ascii" else "utf-8"
+        # encode() without arguments takes a faster path
+        self._is_utf8 = self._encoding == "utf-8"
 
 
 class _StrBinaryDumper(_BaseStrDumper):
@@ -37,6 +39,8 @@ class _StrBinaryDumper(_BaseStrDumper):
 
     def dump(self, obj: str) -> Buffer | None:
         # the server will raise DataError subclass if the string contains 0x00
+        if self._is_utf8:
+            return obj.encode()
         return obj.encode(self._encoding)
 
 
@@ -50,6 +54,8 @@ class _StrDumper(_BaseStrDumper):
     def dump(self, obj: str) -> Buffer | None:
         if "\x00" in obj:
             raise DataError("PostgreSQL text fields cannot contain NUL (0x00) bytes")
+        elif self._is_utf8:
+            return obj.encode()
         else:
             return obj.encode(self._encoding)
 
@@ -109,11 +115,16 @@ class TextLoader(Loader):
         super().__init__(oid, context)
         enc = conn_encoding(self.connection)
         self._encoding = enc if enc != "ascii" else ""
+        # decode() without arguments takes a faster path
+        self._is_utf8 = self._encoding == "utf-8"
 
     def load(self, data: Buffer) -> bytes | str:
         if self._encoding:
             if isinstance(data, memoryview):
-                data = bytes(data)
+                # Decode the buffer without copying it into a bytes first
+                return str(data, self._encoding)
+            if self._is_utf8:
+                return data.decode()
             return data.decode(self._encoding)
         else:
             # return bytes for SQL_ASCII db
@@ -113,17 +113,17 @@ cdef extern from "libpq-fe.h":
         PGRES_TUPLES_CHUNK
 
     # 33.1. Database Connection Control Functions
-    PGconn *PQconnectdb(const char *conninfo)
+    PGconn *PQconnectdb(const char *conninfo) nogil
     PGconn *PQconnectStart(const char *conninfo)
     PostgresPollingStatusType PQconnectPoll(PGconn *conn) nogil
     PQconninfoOption *PQconndefaults()
     PQconninfoOption *PQconninfo(PGconn *conn)
     PQconninfoOption *PQconninfoParse(const char *conninfo, char **errmsg)
     void PQfinish(PGconn *conn)
-    void PQreset(PGconn *conn)
+    void PQreset(PGconn *conn) nogil
     int PQresetStart(PGconn *conn)
     PostgresPollingStatusType PQresetPoll(PGconn *conn)
-    PGPing PQping(const char *conninfo)
+    PGPing PQping(const char *conninfo) nogil
 
     # 33.2. Connection Status Functions
     char *PQdb(const PGconn *conn)
@@ -261,7 +261,7 @@ cdef extern from "libpq-fe.h":
     # 34.7. Canceling Queries in Progress
     PGcancelConn *PQcancelCreate(PGconn *conn)
     int PQcancelStart(PGcancelConn *cancelConn)
-    int PQcancelBlocking(PGcancelConn *cancelConn)
+    int PQcancelBlocking(PGcancelConn *cancelConn) nogil
     PostgresPollingStatusType PQcancelPoll(PGcancelConn *cancelConn) nogil
     ConnStatusType PQcancelStatus(const PGcancelConn *cancelConn)
     int PQcancelSocket(PGcancelConn *cancelConn)
@@ -270,7 +270,7 @@ cdef extern from "libpq-fe.h":
     void PQcancelFinish(PGcancelConn *cancelConn)
     PGcancel *PQgetCancel(PGconn *conn)
     void PQfreeCancel(PGcancel *cancel)
-    int PQcancel(PGcancel *cancel, char *errbuf, int errbufsize)
+    int PQcancel(PGcancel *cancel, char *errbuf, int errbufsize) nogil
 
     # 33.8. Asynchronous Notification
     PGnotify *PQnotifies(PGconn *conn) nogil
@@ -35,7 +35,10 @@ cdef class PGcancelConn:
 
         See :pq:`PQcancelBlocking` for details.
         """
-        if not libpq.PQcancelBlocking(self.pgcancelconn_ptr):
+        cdef int rv
+        with nogil:
+            rv = libpq.PQcancelBlocking(self.pgcancelconn_ptr)
+        if not rv:
             raise e.OperationalError(
                 f"couldn't send cancellation: {self.get_error_message()}"
             )
@@ -96,7 +99,9 @@ cdef class PGcancel:
 
     def cancel(self) -> None:
         cdef char buf[256]
-        cdef int res = libpq.PQcancel(self.pgcancel_ptr, buf, sizeof(buf))
+        cdef int res
+        with nogil:
+            res = libpq.PQcancel(self.pgcancel_ptr, buf, sizeof(buf))
         if not res:
             raise e.OperationalError(
                 f"cancel failed: {buf.decode('utf8', 'ignore')}"
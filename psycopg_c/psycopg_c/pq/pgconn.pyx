@@ -65,7 +65,9 @@ cdef class PGconn:
 
     @classmethod
     def connect(cls, const char *conninfo) -> PGconn:
-        cdef libpq.PGconn* pgconn = libpq.PQconnectdb(conninfo)
+        cdef libpq.PGconn* pgconn
+        with nogil:
+            pgconn = libpq.PQconnectdb(conninfo)
         if not pgconn:
             raise MemoryError("couldn't allocate PGconn")
 
@@ -106,7 +108,8 @@ cdef class PGconn:
 
     def reset(self) -> None:
         _ensure_pgconn(self)
-        libpq.PQreset(self._pgconn_ptr)
+        with nogil:
+            libpq.PQreset(self._pgconn_ptr)
 
     def reset_start(self) -> None:
         if not libpq.PQresetStart(self._pgconn_ptr):
@@ -116,8 +119,11 @@ cdef class PGconn:
         return _call_int(self, <conn_int_f>libpq.PQresetPoll)
 
     @classmethod
-    def ping(self, const char *conninfo) -> int:
-        return libpq.PQping(conninfo)
+    def ping(cls, const char *conninfo) -> int:
+        cdef int rv
+        with nogil:
+            rv = libpq.PQping(conninfo)
+        return rv
 
     @property
     def db(self) -> bytes:
@@ -281,16 +281,19 @@ def test_encoding(pgconn):
     res = pgconn.exec_(b"set client_encoding to latin1")
     assert res.status == pq.ExecStatus.COMMAND_OK
     assert pgconn.parameter_status(b"client_encoding") == b"LATIN1"
+    assert pgconn._encoding == "iso8859-1"
 
     res = pgconn.exec_(b"set client_encoding to 'utf-8'")
     assert res.status == pq.ExecStatus.COMMAND_OK
     assert pgconn.parameter_status(b"client_encoding") == b"UTF8"
+    assert pgconn._encoding == "utf-8"
 
     res = pgconn.exec_(b"set client_encoding to wat")
     assert res.status == pq.ExecStatus.FATAL_ERROR
     assert pgconn.parameter_status(b"client_encoding") == b"UTF8"
 
     pgconn.finish()
+    assert pgconn._encoding == "utf-8"
     with pytest.raises(psycopg.OperationalError):
         pgconn.parameter_status(b"client_encoding")
 
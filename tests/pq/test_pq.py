@@ -32,6 +32,12 @@ def test_want_import_version():
     assert not check_libpq_version(got, want)
 
 
+@pytest.mark.skipif("sys.implementation.name != 'pypy'")
+@pytest.mark.skipif("os.environ.get('PSYCOPG_IMPL')")
+def test_pypy_default_impl():
+    assert pq.__impl__ == "cffi"
+
+
 # Note: These tests are here because test_pipeline.py tests are all skipped
 # when pipeline mode is not supported.
 
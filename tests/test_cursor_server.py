@@ -1,6 +1,8 @@
 # WARNING: this file is auto-generated by 'async_to_sync.py'
 # from the original file 'test_cursor_server_async.py'
 # DO NOT CHANGE! Change the original file instead.
+import re
+
 import pytest
 from packaging.version import parse as ver
 
@@ -414,6 +416,14 @@ def test_rownumber(conn):
     cur.close()
 
 
+def test_fetchmany_bad_size(conn):
+    with conn.cursor("foo") as cur:
+        cur.execute("select generate_series(1, 10)")
+        with pytest.raises(TypeError):
+            cur.fetchmany(2.7)
+        assert cur.fetchone() == (1,)
+
+
 def test_iter(conn):
     with conn.cursor("foo") as cur:
         cur.execute(ph(cur, "select generate_series(1, %s) as bar"), (3,))
@@ -448,6 +458,85 @@ def test_itersize(conn, commands):
             assert "fetch forward 2" in cmd.lower()
 
 
+def test_itersize_adaptive(conn, commands):
+    with conn.cursor("foo") as cur:
+        cur.itersize = None
+        cur.execute("select generate_series(1, 1000)::int4 as bar")
+        commands.popall()  # flush begin and other noise
+
+        assert len(list(cur)) == 1000
+        cmds = commands.popall()
+        sizes = re.findall(r"fetch forward (\d+)", " ".join(cmds).lower())
+        assert sizes == ["100", "200", "400", "800"]
+
+        cur.execute(
+            "select repeat('x', 10) as a, repeat('y', 10) as b"
+            " from generate_series(1, 1000)"
+        )
+        commands.popall()
+        assert len(list(cur)) == 1000
+        cmds = commands.popall()
+        sizes = re.findall(r"fetch forward (\d+)", " ".join(cmds).lower())
+        assert sizes == ["100", "200", "400", "512"]
+        assert cur.itersize is None
+
+
+def test_itersize_multiple(conn):
+    with conn.cursor("foo") as cur:
+        cur.itersize = 2
+        cur.execute(ph(cur, "select generate_series(1, %s) as bar"), (4,))
+        recs = list(cur)
+    assert recs == [(1,), (2,), (3,), (4,)]
+
+
+def test_iter_interleaved(conn):
+    with conn.cursor("foo") as cur:
+        cur.itersize = 2
+        cur.execute(ph(cur, "select generate_series(1, %s) as bar"), (5,))
+        recs = []
+        for rec in cur:
+            recs.append(rec)
+            with conn.cursor() as cur2:
+                cur2.execute("select 1")
+                assert cur2.fetchone() == (1,)
+    assert recs == [(1,), (2,), (3,), (4,), (5,)]
+
+
+def test_iter_error(conn):
+    with conn.cursor("foo") as cur:
+        cur.itersize = 100
+        cur.execute("select 1 / (x - 150) from generate_series(1, 300) x")
+        recs = []
+        with pytest.raises(e.DivisionByZero):
+            for rec in cur:
+                recs.append(rec)
+    assert len(recs) == 100
+
+
+def test_iter_error_execute(conn):
+    with conn.cursor("foo") as cur:
+        cur.itersize = 100
+        cur.execute("select 1 / (x - 150) from generate_series(1, 300) x")
+        recs = []
+        with pytest.raises(e.DivisionByZero):
+            for rec in cur:
+                conn.execute("select %s", rec)
+                recs.append(rec)
+    assert len(recs) == 100
+
+
+def test_iter_break_fetchone(conn):
+    with conn.cursor("foo") as cur:
+        cur.itersize = 10
+        cur.execute("select generate_series(1, 100)")
+        for rec in cur:
+            if rec[0] == 5:
+                break
+
+        # The rest of the current batch is lost.
+        assert cur.fetchone() == (11,)
+
+
 def test_cant_scroll_by_default(conn):
     cur = conn.cursor("tmp")
     assert cur.scrollable is None
@@ -471,6 +560,9 @@ def test_scroll(conn):
 
     with pytest.raises(ValueError):
         cur.scroll(9, mode="wat")
+    with pytest.raises(TypeError):
+        cur.scroll(1.5)
+    assert cur.fetchone() is None
     cur.close()
 
 
@@ -487,6 +579,16 @@ def test_scrollable(conn):
     curs.close()
 
 
+@pytest.mark.crdb_skip("scroll cursor")
+@pytest.mark.parametrize("scrollable", [1, "yes"])
+def test_scrollable_not_bool(conn, scrollable):
+    with conn.cursor("foo", scrollable=scrollable) as curs:
+        curs.execute("select generate_series(0, 5)")
+        curs.scroll(5)
+        curs.scroll(-1)
+        assert curs.fetchone() == (4,)
+
+
 def test_non_scrollable(conn):
     curs = conn.cursor("foo", scrollable=False)
     assert curs.scrollable is False
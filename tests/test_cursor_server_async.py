@@ -1,3 +1,5 @@
+import re
+
 import pytest
 from packaging.version import parse as ver
 
@@ -421,6 +423,14 @@ async def test_rownumber(aconn):
     await cur.close()
 
 
+async def test_fetchmany_bad_size(aconn):
+    async with aconn.cursor("foo") as cur:
+        await cur.execute("select generate_series(1, 10)")
+        with pytest.raises(TypeError):
+            await cur.fetchmany(2.7)
+        assert await cur.fetchone() == (1,)
+
+
 async def test_iter(aconn):
     async with aconn.cursor("foo") as cur:
         await cur.execute(ph(cur, "select generate_series(1, %s) as bar"), (3,))
@@ -455,6 +465,85 @@ async def test_itersize(aconn, acommands):
             assert "fetch forward 2" in cmd.lower()
 
 
+async def test_itersize_adaptive(aconn, acommands):
+    async with aconn.cursor("foo") as cur:
+        cur.itersize = None
+        await cur.execute("select generate_series(1, 1000)::int4 as bar")
+        acommands.popall()  # flush begin and other noise
+
+        assert len(await alist(cur)) == 1000
+        cmds = acommands.popall()
+        sizes = re.findall(r"fetch forward (\d+)", " ".join(cmds).lower())
+        assert sizes == ["100", "200", "400", "800"]
+
+        await cur.execute(
+            "select repeat('x', 10) as a, repeat('y', 10) as b"
+            " from generate_series(1, 1000)"
+        )
+        acommands.popall()
+        assert len(await alist(cur)) == 1000
+        cmds = acommands.popall()
+        sizes = re.findall(r"fetch forward (\d+)", " ".join(cmds).lower())
+        assert sizes == ["100", "200", "400", "512"]
+        assert cur.itersize is None
+
+
+async def test_itersize_multiple(aconn):
+    async with aconn.cursor("foo") as cur:
+        cur.itersize = 2
+        await cur.execute(ph(cur, "select generate_series(1, %s) as bar"), (4,))
+        recs = await alist(cur)
+    assert recs == [(1,), (2,), (3,), (4,)]
+
+
+async def test_iter_interleaved(aconn):
+    async with aconn.cursor("foo") as cur:
+        cur.itersize = 2
+        await cur.execute(ph(cur, "select generate_series(1, %s) as bar"), (5,))
+        recs = []
+        async for rec in cur:
+            recs.append(rec)
+            async with aconn.cursor() as cur2:
+                await cur2.execute("select 1")
+                assert await cur2.fetchone() == (1,)
+    assert recs == [(1,), (2,), (3,), (4,), (5,)]
+
+
+async def test_iter_error(aconn):
+    async with aconn.cursor("foo") as cur:
+        cur.itersize = 100
+        await cur.execute("select 1 / (x - 150) from generate_series(1, 300) x")
+        recs = []
+        with pytest.raises(e.DivisionByZero):
+            async for rec in cur:
+                recs.append(rec)
+    assert len(recs) == 100
+
+
+async def test_iter_error_execute(aconn):
+    async with aconn.cursor("foo") as cur:
+        cur.itersize = 100
+        await cur.execute("select 1 / (x - 150) from generate_series(1, 300) x")
+        recs = []
+        with pytest.raises(e.DivisionByZero):
+            async for rec in cur:
+                await aconn.execute("select %s", rec)
+                recs.append(rec)
+    assert len(recs) == 100
+
+
+async def test_iter_break_fetchone(aconn):
+    async with aconn.cursor("foo") as cur:
+        cur.itersize = 10
+        await cur.execute("select generate_series(1, 100)")
+        async for rec in cur:
+            if rec[0] == 5:
+                break
+
+        # The rest of the current batch is lost.
+        assert await cur.fetchone() == (11,)
+
+
 async def test_cant_scroll_by_default(aconn):
     cur = aconn.cursor("tmp")
     assert cur.scrollable is None
@@ -478,6 +567,9 @@ async def test_scroll(aconn):
 
     with pytest.raises(ValueError):
         await cur.scroll(9, mode="wat")
+    with pytest.raises(TypeError):
+        await cur.scroll(1.5)
+    assert await cur.fetchone() is None
     await cur.close()
 
 
@@ -494,6 +586,16 @@ async def test_scrollable(aconn):
     await curs.close()
 
 
+@pytest.mark.crdb_skip("scroll cursor")
+@pytest.mark.parametrize("scrollable", [1, "yes"])
+async def test_scrollable_not_bool(aconn, scrollable):
+    async with aconn.cursor("foo", scrollable=scrollable) as curs:
+        await curs.execute("select generate_series(0, 5)")
+        await curs.scroll(5)
+        await curs.scroll(-1)
+        assert await curs.fetchone() == (4,)
+
+
 async def test_non_scrollable(aconn):
     curs = aconn.cursor("foo", scrollable=False)
     assert curs.scrollable is False